@@ -8,7 +8,6 @@ import sys
 
 import cv2
 import numpy as np
-import pandas as pd
 
 from phenopype import __version__
 from phenopype import settings
@@ -156,6 +155,8 @@ def export_csv(
 
     """
 
+    pd = utils_lowlevel._pandas()
+
     ## dirpath
     if not image_name:
         print(
@@ -404,17 +405,18 @@ def load_annotation(filepath, annotation_type=None, annotation_id=None, tag=None
         return
 
     ## parse serialized array
+    array_keys = (
+        settings._annotation_types
+        - {settings._comment_type, settings._reference_type}
+        | {"support"}
+    )
     for annotation_type1 in annotation_file:
         for annotation_id1 in annotation_file[annotation_type1]:
             for section in annotation_file[annotation_type1][annotation_id1]:
                 for key, value in annotation_file[annotation_type1][annotation_id1][
                     section
                 ].items():
-                    if key in [
-                        x
-                        for x in settings._annotation_types
-                        if not x in [settings._comment_type, settings._reference_type,]
-                    ] + ["support"]:
+                    if key in array_keys:
                         if type(value) == str:
                             value = eval(value)
                         if key == settings._contour_type:
@@ -791,6 +793,7 @@ def save_canvas(image, dir_path, file_name="canvas", **kwargs):
     ext = kwargs.get("ext", ".jpg")
     resize = kwargs.get("resize", 0.5)
     overwrite = kwargs.get("overwrite", True)
+    quality = kwargs.get("quality", 95)
 
     utils.save_image(
         image=image,
@@ -799,5 +802,6 @@ def save_canvas(image, dir_path, file_name="canvas", **kwargs):
         dir_path=dir_path,
         resize=resize,
         overwrite=overwrite,
+        quality=quality,
         verbose=settings.flag_verbose,
     )
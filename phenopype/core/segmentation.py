@@ -1,6 +1,5 @@
 #%% modules
 
-import copy
 import cv2
 import numpy as np
 import sys
@@ -224,7 +223,7 @@ def detect_contour(
     # =============================================================================
     # setup
 
-    image_bin = copy.deepcopy(image)
+    image_bin = image.copy()
 
     if len(image_bin.shape) > 2:
         print("Multi-channel array supplied - need binary array.")
@@ -260,8 +259,8 @@ def detect_contour(
 
     _, contours_det, hierarchies_det = cv2.findContours(
         image=image_bin,
-        mode=settings.opencv_contour_flags["retrieval"][retrieval],
-        method=settings.opencv_contour_flags["approximation"][approximation],
+        mode=settings.resolve_flag("contour_retrieval", retrieval),
+        method=settings.resolve_flag("contour_approximation", approximation),
         offset=tuple(offset_coords),
     )
 
@@ -1,6 +1,5 @@
 #%% modules
 
-import copy
 import cv2
 import numpy as np
 import math
@@ -14,6 +13,10 @@ from phenopype import utils_lowlevel
 
 inf = math.inf
 
+## resolved once, used by select_canvas
+_BGR2GRAY = cv2.COLOR_BGR2GRAY
+_GRAY2BGR = cv2.COLOR_GRAY2BGR
+
 #%% functions
 
 
@@ -149,11 +152,11 @@ def draw_contour(
     # =============================================================================
     # execute
 
-    canvas = copy.deepcopy(image)
+    canvas = image.copy()
 
     ## 1) fill contours
     if flags.fill:
-        colour_mask = copy.deepcopy(canvas)
+        colour_mask = canvas.copy()
         for contour in contours:
             cv2.drawContours(
                 image=canvas,
@@ -294,7 +297,7 @@ def draw_landmark(
     # =============================================================================
     # execute
 
-    canvas = copy.deepcopy(image)
+    canvas = image.copy()
 
     for idx, point in enumerate(points):
         x, y = point
@@ -401,7 +404,7 @@ def draw_mask(
     # =============================================================================
     # execute
 
-    canvas = copy.deepcopy(image)
+    canvas = image.copy()
 
     for coords in polygons:
         cv2.polylines(
@@ -521,7 +524,7 @@ def draw_polyline(
     # =============================================================================
     # execute
 
-    canvas = copy.deepcopy(image)
+    canvas = image.copy()
 
     ## draw lines
     for coords in lines:
@@ -627,9 +630,12 @@ def draw_QRcode(
     points = annotation["data"][settings._mask_type]
     label = annotation["data"][annotation_type]
 
-    
-    canvas = cv2.polylines(
-        image, 
+    # =============================================================================
+    # execute
+
+    canvas = image.copy()
+    cv2.polylines(
+        canvas, 
         [np.asarray(points, np.int32)], 
         True, 
         line_colour, 
@@ -736,7 +742,7 @@ def draw_reference(
     # =============================================================================
     # execute
 
-    canvas = copy.deepcopy(image)
+    canvas = image.copy()
 
     ## draw referenc mask outline
     print([polygons[0]])
@@ -824,57 +830,62 @@ def select_canvas(image, canvas="raw", multi_channel=True, **kwargs):
 
         ## method
         if canvas == "mod":
-            image.canvas = copy.deepcopy(image.image)
+            image.canvas = utils_lowlevel._read_only_view(image.image)
             print("- modifed image")
         elif canvas == "raw":
-            image.canvas = copy.deepcopy(image.image_copy)
+            image.canvas = utils_lowlevel._read_only_view(image.image_copy)
             print("- raw image")
         # elif canvas == "bin":
         #     image.canvas = copy.deepcopy(image.image_bin)
         # print("- binary image")
         elif canvas == "gray":
-            image.canvas = cv2.cvtColor(image.image_copy, cv2.COLOR_BGR2GRAY)
+            ## the reference image doesn't change - convert it only once 
+            ## (keep the source array itself, ids can be reused)
+            if not getattr(image, "_gray_cache_src", None) is image.image_copy:
+                image._gray_cache = cv2.cvtColor(image.image_copy, _BGR2GRAY)
+                image._gray_cache_src = image.image_copy
+            image.canvas = utils_lowlevel._read_only_view(image._gray_cache)
             print("- grayscale image")
         elif canvas == "blue":
-            image.canvas = image.image_copy[:, :, 0]
+            image.canvas = cv2.extractChannel(image.image_copy, 0)
             print("- blue channel")
         elif canvas == "green":
-            image.canvas = image.image_copy[:, :, 1]
+            image.canvas = cv2.extractChannel(image.image_copy, 1)
             print("- green channel")
         elif canvas == "red":
-            image.canvas = image.image_copy[:, :, 2]
+            image.canvas = cv2.extractChannel(image.image_copy, 2)
             print("- red channel")
         else:
             print("- invalid selection - defaulting to raw image")
-            image.canvas = copy.deepcopy(image.image_copy)
+            image.canvas = utils_lowlevel._read_only_view(image.image_copy)
 
     elif image.__class__.__name__ == "ndarray":
         if canvas == "raw":
-            canvas = copy.deepcopy(image)
+            canvas = image.copy()
             print("- raw image")
         elif canvas == "gray":
-            canvas = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            canvas = cv2.cvtColor(image, _BGR2GRAY)
             print("- grayscale image")
         elif canvas == "blue":
-            canvas = image[:, :, 0]
+            canvas = cv2.extractChannel(image, 0)
             print("- blue channel")
         elif canvas == "green":
-            canvas = image[:, :, 1]
+            canvas = cv2.extractChannel(image, 1)
             print("- green channel")
         elif canvas == "red":
-            canvas = image[:, :, 2]
+            canvas = cv2.extractChannel(image, 2)
             print("- red channel")  
         else:
-            canvas = copy.deepcopy(image)
+            canvas = image.copy()
             print("- invalid selection - defaulting to raw image")
 
     ## check if colour
     if multi_channel:
         if image.__class__.__name__ == "Container":
             if len(image.canvas.shape) < 3:
-                image.canvas = cv2.cvtColor(image.canvas, cv2.COLOR_GRAY2BGR)
+                image.canvas = cv2.cvtColor(image.canvas, _GRAY2BGR)
         elif image.__class__.__name__ == "ndarray":
             if len(canvas.shape) < 3:
-                canvas = cv2.cvtColor(canvas, cv2.COLOR_GRAY2BGR)
+                canvas = cv2.cvtColor(canvas, _GRAY2BGR)
 
     return canvas
@@ -3,7 +3,6 @@
 import copy
 import os
 import numpy as np
-import pandas as pd
 import platform
 import string
 import io 
@@ -13,16 +12,22 @@ import logging
 from dataclasses import make_dataclass
 
 import pprint
+import re
 import subprocess
 import time
 import zipfile
 
 import cv2
 import ruamel.yaml
-from datetime import datetime
 
 import shutil
+from pathlib import Path, PurePath
+from stat import S_ISDIR, S_ISREG
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from ruamel.yaml.comments import CommentedMap as ordereddict
+from ruamel.yaml.comments import CommentedSeq
 
 from phenopype import __version__
 from phenopype import _config
@@ -41,14 +46,46 @@ from phenopype.core import (
 
 #%% settings
 
-pd.options.display.max_rows = (
-    settings.pandas_max_rows
-)  # how many rows of pd-dataframe to show
 pretty = pprint.PrettyPrinter(width=30)  # pretty print short strings
 ruamel.yaml.Representer.add_representer(
     ordereddict, ruamel.yaml.Representer.represent_dict
 )  # suppress !!omap node info
 
+## system and command used to open config files in the default editor
+_PLATFORM = platform.system()
+_OPEN_CMD = {"Darwin": ("open",), "Windows": None}.get(_PLATFORM, ("xdg-open",))
+
+## pype steps and the functions they provide - looked up instead of eval-ing
+## the step names from the config
+_STEP_MODULES = {
+    "preprocessing": preprocessing,
+    "segmentation": segmentation,
+    "measurement": measurement,
+    "export": export,
+    "visualization": visualization,
+    "plugins": plugins,
+}
+_STEP_FUNCS = {
+    step_name: frozenset(name for name in dir(module) if not name.startswith("_"))
+    for step_name, module in _STEP_MODULES.items()
+}
+
+## annotation ids
+_ID_LETTERS = tuple(string.ascii_lowercase)
+
+## annotation functions whose annotations are overwritten by default
+_ANNOTATION_OVERWRITE_FUNCS = frozenset([
+    "contour_to_mask",
+    "detect_contour",
+    "detect_mask",
+    "compute_shape_features",
+    "compute_texture_features",
+    "detect_skeleton",
+])
+
+## files never counted as existing output when checking for skips
+_SKIP_EXCLUDE = re.compile("pype_config|attributes").search
+
 #%% classes
 
 
@@ -89,12 +126,9 @@ class Project:
         print("--------------------------------------------")
         while True:
             if os.path.isdir(root_dir):
-                if all(
-                    [
-                        "attributes.yaml" in os.listdir(root_dir),
-                        "data" in os.listdir(root_dir),
-                    ]
-                ):
+                if os.path.isfile(
+                    os.path.join(root_dir, "attributes.yaml")
+                ) and os.path.isdir(os.path.join(root_dir, "data")):
                     if flags.load and not flags.overwrite:
                         print(
                             "Found existing project root directory - loading from:\n"
@@ -144,17 +178,17 @@ class Project:
                     return
 
         ## read directories
-        dir_names_counted, dir_paths = os.listdir(os.path.join(root_dir, "data")), []
-        for file_path in os.listdir(os.path.join(root_dir, "data")):
-            dir_paths.append(os.path.join(root_dir, "data", file_path))
+        self.root_dir = root_dir
+        self._scan_data_dir()
 
         ## global project attributes
         project_attributes_path = os.path.join(root_dir, "attributes.yaml")
         if not os.path.isfile(project_attributes_path):
+            date_created = settings.format_timestamp()
             project_attributes = {
                 "project_info": {
-                    "date_created": datetime.today().strftime(settings.strftime_format),
-                    "date_changed": datetime.today().strftime(settings.strftime_format),
+                    "date_created": date_created,
+                    "date_changed": date_created,
                     "phenopype_version": __version__,
                 },
                 "project_data": {
@@ -179,7 +213,7 @@ class Project:
                 file_names_attr = project_attributes["project_data"]["filenames"]
                 dir_names_attr = project_attributes["project_data"]["dirnames"]
 
-                if len(dir_names_attr) == len(file_names_attr) == len(dir_names_counted):
+                if len(dir_names_attr) == len(file_names_attr) == len(self.dir_names):
                     flags.checked = True
                     print("\nChecks for directory completeness passed!")
 
@@ -189,9 +223,9 @@ class Project:
             else:
                 print("\nWARNING: Potentially broken project attributes file - could not check for completeness.")
                 
-            if len(dir_names_counted) > 0:
+            if len(self.dir_names) > 0:
                 print('\nProject "{}" successfully loaded with {} images'.format(
-                        os.path.basename(root_dir), len(dir_paths)
+                        os.path.basename(root_dir), len(self.dir_paths)
                     ))
             else:
                 print('\nProject "{}" successfully loaded, but it didn\'t contain any images!'.format(
@@ -201,8 +235,6 @@ class Project:
         print("--------------------------------------------")
 
         ## attach to instance
-        self.root_dir = root_dir
-        self.dir_paths = dir_paths
         if flags.checked:
             self.file_names = file_names_attr
         else:
@@ -210,6 +242,9 @@ class Project:
         ## add attributes
         self.attributes = project_attributes
         self.attributes_path = project_attributes_path
+        
+        ## parsed yaml files, keyed by path and validated by mtime/size
+        self._yaml_cache = OrderedDict()
 
         # self.file_names, self.file_paths = [], []
         # for dir_path in self.dir_paths:
@@ -217,6 +252,132 @@ class Project:
         #     self.file_paths.append(attributes["image_phenopype"]["filepath"])
         #     self.file_names.append(attributes["image_phenopype"]["filename"])          
 
+    def _scan_data_dir(self):
+        
+        ## single pass over the data folder - DirEntry already carries the path
+        ## and the file type, so stray files are skipped without extra stats
+        dir_names, dir_paths = [], []
+        with os.scandir(os.path.join(self.root_dir, "data")) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                dir_names.append(entry.name)
+                dir_paths.append(entry.path)
+        self.dir_names = dir_names
+        self.dir_paths = dir_paths
+
+    def _add_file(
+        self, 
+        file_path, 
+        dir_name, 
+        dir_path, 
+        relpath, 
+        flags, 
+        resize_factor, 
+        resize_max_dim, 
+        image_format,
+        date_added,
+    ):
+        
+        ## runs inside a worker thread - messages are returned, not printed
+        messages = []
+        
+        ## image name and extension
+        image_name = os.path.basename(file_path)
+        image_name_stem = os.path.splitext(image_name)[0]
+        image_ext = os.path.splitext(image_name)[1]
+        
+        ## generate image attributes
+        image_data_original = utils_lowlevel._load_image_data(file_path)
+        image_data_phenopype = {
+            "date_added": date_added,
+            "mode": flags.mode,
+        }
+
+        ## copy or link raw files
+        if flags.mode == "copy":
+            image_phenopype_path = dir_path + os.sep + image_name_stem + "_copy" + image_ext
+            utils_lowlevel._copy_file(file_path, image_phenopype_path)
+            
+            ## a byte-identical copy has the same dimensions - no need to 
+            ## open it again
+            image_data_phenopype.update({
+                "filename": os.path.basename(image_phenopype_path),
+                "width": image_data_original["width"],
+                "height": image_data_original["height"],
+                })
+
+        elif flags.mode == "mod":
+            image = utils.load_image(file_path)
+            image = utils_lowlevel._resize_image(
+                image, 
+                factor=resize_factor, 
+                max_dim=resize_max_dim
+                )
+            if not image_format.__class__.__name__ == "NoneType":
+                if not "." in image_format:
+                    ext = "." + image_format
+                else:
+                    ext = image_format
+            else:
+                ext = image_ext
+            image_phenopype_path = dir_path + os.sep + image_name_stem + "_mod" + ext
+            if all([
+                    os.path.isfile(image_phenopype_path),
+                    flags.overwrite in ["file", "files", "image", True]
+                    ]):
+                messages.append(
+                    "Found image "
+                    + relpath
+                    + " - "
+                    + "overwriting image and attributes in "
+                    + dir_name
+                    + ' (overwrite={})'.format(flags.overwrite)
+                )
+            cv2.imwrite(image_phenopype_path, image)
+            image_data_phenopype.update(
+                {"resize": flags.resize, "resize_factor": resize_factor,}
+            )
+            
+            ## dimensions of the written image are known from the array
+            height, width = image.shape[:2]
+            image_data_phenopype.update({
+                "filename": os.path.basename(image_phenopype_path),
+                "width": width,
+                "height": height,
+                })
+
+        elif flags.mode == "link":                
+            image_phenopype_path = os.path.relpath(file_path, start=dir_path)
+            
+            ## same file as the original - only the path is stored relative
+            image_data_phenopype.update(image_data_original)
+            image_data_phenopype.update({
+                "filepath": image_phenopype_path,
+                "filetype": os.path.splitext(image_phenopype_path)[1],
+                })
+            if all([
+                    os.path.isfile(dir_path + os.sep + "attributes.yaml"),
+                    flags.overwrite in ["file", "files", "image", True]
+                    ]):
+                messages.append(
+                    "Found image "
+                    + relpath
+                    + " - "
+                    + "overwriting attributes in "
+                    + dir_name
+                    + ' (overwrite={})'.format(flags.overwrite)
+                )
+
+        ## write attributes file
+        attributes = {
+            "image_original": image_data_original,
+            "image_phenopype": image_data_phenopype,
+        }
+        utils_lowlevel._save_yaml(attributes, dir_path + os.sep + "attributes.yaml")
+        
+        return messages
+
     def add_files(
         self,
         image_dir,
@@ -256,9 +417,10 @@ class Project:
         image_dir: str 
             path to directory with images
         filetypes: list or str, optional
-            single or multiple string patterns to target files with certain endings.
+            single or multiple file extensions to target (case-insensitive, with 
+            or without leading dot - e.g. "jpg" or ".JPG"). 
             "settings.default_filetypes" are configured in settings.py: 
-            ['jpg', 'JPG', 'jpeg', 'JPEG', 'tif', 'png', 'bmp']
+            {'jpg', 'jpeg', 'tif', 'png', 'bmp'}
         include: list or str, optional
             single or multiple string patterns to target certain files to include
         include_all (optional): bool,
@@ -290,7 +452,8 @@ class Project:
         resize_factor: float, optional
             
         kwargs: 
-            developer options
+            developer options - "n_workers" sets the number of threads used to 
+            copy/convert images (default: number of CPUs)
         """
 
         # kwargs
@@ -332,7 +495,7 @@ class Project:
         print("\nusing the following settings:\n")
         print(
             "filetypes: "
-            + str(filetypes)
+            + str([filetypes] if isinstance(filetypes, str) else sorted(filetypes))
             + ", include: "
             + str(include)
             + ", exclude: "
@@ -357,62 +520,83 @@ class Project:
         else:
             n_max = "all"
             
-        ## loop through files
-        filenames = []
+        ## one timestamp for all files added in this call
+        date_added = settings.format_timestamp()
+        
+        ## data folder prefix (with trailing separator) for building paths in 
+        ## the loops below
+        data_dir_prefix = os.path.join(self.root_dir, "data", "")
+        
+        ## lookup for images already in the project (first occurrence wins,
+        ## as with list.index)
+        file_name_idx = {}
+        for idx, file_name in enumerate(self.file_names):
+            file_name_idx.setdefault(file_name, idx)
+        
+        ## resolve target folders in sequence - this is cheap, and keeps 
+        ## folder creation and the dir lists of the project free of races
+        filenames, jobs = [], {}
         for file_path in filepaths:
             
-            ## image name and extension
-            image_name = os.path.basename(file_path)
-            image_name_stem = os.path.splitext(image_name)[0]
-            image_ext = os.path.splitext(image_name)[1]
-            filenames.append(image_name)
-
             ## generate folder paths by flattening nested directories; one
-            ## folder per file
-            relpath = os.path.relpath(file_path, image_dir)
-            depth = relpath.count("\\")
-            relpath_flat = os.path.dirname(relpath).replace("\\", "__")
+            ## folder per file. path parts are separator-agnostic, so this
+            ## works on posix as well
+            try:
+                relpath_parts = PurePath(file_path).relative_to(image_dir).parts
+            except ValueError:
+                relpath_parts = PurePath(os.path.relpath(file_path, image_dir)).parts
+            depth = len(relpath_parts) - 1
             if depth > 0:
-                subfolder_prefix = str(depth) + "__" + relpath_flat + "__"
+                subfolder_prefix = str(depth) + "__" + "__".join(relpath_parts[:-1]) + "__"
             else:
                 subfolder_prefix = str(depth) + "__"
                 
+            ## image name and extension
+            image_name = relpath_parts[-1]
+            filenames.append(image_name)
+
             ## check if image exists
-            if image_name in self.file_names:
-                image_idx = self.file_names.index(image_name)
-                dir_name = (subfolder_prefix + image_name_stem)
-                dir_path = self.dir_paths[image_idx]
+            dir_name = subfolder_prefix + os.path.splitext(image_name)[0]
+            if image_name in file_name_idx:
+                dir_path = self.dir_paths[file_name_idx[image_name]]
             else:
-                dir_name = (subfolder_prefix + image_name_stem)
-                dir_path = os.path.join(self.root_dir, "data", dir_name)
+                dir_path = data_dir_prefix + dir_name
                 
-            ## make image-specific directories
-            if os.path.isdir(dir_path):
-                if flags.overwrite == False:
-                    print(
-                        "Found image "
-                        + relpath
-                        + " - "
-                        + dir_name
-                        + " already exists (overwrite=False)"
-                    )
-                    continue
-                elif flags.overwrite in ["file", "files", "image", True]:
-                    pass
-                elif flags.overwrite == "dir":
+            ## skip existing folders right away - nothing else is done for 
+            ## them, so re-runs on a populated project cost one stat per file
+            ## (folders claimed by a previous file in this run count as existing)
+            dir_exists = dir_path in jobs or os.path.isdir(dir_path)
+            relpath = os.path.join(*relpath_parts)
+            if dir_exists and flags.overwrite == False:
+                print(
+                    "Found image "
+                    + relpath
+                    + " - "
+                    + dir_name
+                    + " already exists (overwrite=False)"
+                )
+                continue
+                
+            ## make image-specific directories (existing ones are only 
+            ## replaced with overwrite="dir", otherwise they are reused). 
+            ## folders claimed earlier in this run are still empty - 
+            ## replacing them means dropping the queued files
+            if dir_exists and flags.overwrite == "dir":
+                if dir_path in jobs:
+                    jobs[dir_path] = []
+                else:
                     shutil.rmtree(
                         dir_path, ignore_errors=True, onerror=utils_lowlevel._del_rw
                     )
-                    print(
-                        "Found image "
-                        + relpath
-                        + " - "
-                        + "phenopype-project folder "
-                        + dir_name
-                        + ' created (overwrite="dir")'
-                    )
-                    os.mkdir(dir_path)
-            else:
+                print(
+                    "Found image "
+                    + relpath
+                    + " - "
+                    + "phenopype-project folder "
+                    + dir_name
+                    + ' created (overwrite="dir")'
+                )
+            elif not dir_exists:
                 print(
                     "Found image "
                     + relpath
@@ -421,119 +605,51 @@ class Project:
                     + dir_name
                     + " created"
                 )
-                os.mkdir(dir_path)
+                self.dir_names.append(dir_name)
+                self.dir_paths.append(dir_path)
+            os.makedirs(dir_path, exist_ok=True)
                 
-            ## generate image attributes
-            image_data_original = utils_lowlevel._load_image_data(file_path)
-            image_data_phenopype = {
-                "date_added": datetime.today().strftime(settings.strftime_format),
-                "mode": flags.mode,
-            }
-
-            ## copy or link raw files
-            if flags.mode == "copy":
-                image_phenopype_path = os.path.join(
-                    self.root_dir, "data", dir_name, image_name_stem + "_copy" + image_ext,
-                )
-                shutil.copyfile(file_path, image_phenopype_path)
-                image_data_phenopype.update(
-                    utils_lowlevel._load_image_data(
-                        image_phenopype_path, path_and_type=False
-                    )
-                )
-
-            elif flags.mode == "mod":
-                image = utils.load_image(file_path)
-                image = utils_lowlevel._resize_image(
-                    image, 
-                    factor=resize_factor, 
-                    max_dim=resize_max_dim
-                    )
-                if not image_format.__class__.__name__ == "NoneType":
-                    if not "." in image_format:
-                        ext = "." + image_format
-                else:
-                    ext = image_ext
-                image_phenopype_path = os.path.join(
-                    self.root_dir, "data", dir_name, image_name_stem + "_mod" + ext,
-                )
-                if all([
-                        os.path.isfile(image_phenopype_path),
-                        flags.overwrite in ["file", "files", "image", True]
-                        ]):
-                    print(
-                        "Found image "
-                        + relpath
-                        + " - "
-                        + "overwriting image and attributes in "
-                        + dir_name
-                        + ' (overwrite={})'.format(flags.overwrite)
-                    )
-                cv2.imwrite(image_phenopype_path, image)
-                image_data_phenopype.update(
-                    {"resize": flags.resize, "resize_factor": resize_factor,}
-                )
-                image_data_phenopype.update(
-                    utils_lowlevel._load_image_data(
-                        image_phenopype_path, path_and_type=False
-                    )
-                )
-
-            elif flags.mode == "link":                
-                image_phenopype_path = os.path.relpath(file_path, start=dir_path)
-                image_data_phenopype.update(
-                    utils_lowlevel._load_image_data(
-                        image_path=file_path, 
-                        image_rel_path=image_phenopype_path,
-                        path_and_type=True
-                        )
-                    )
-                if all([
-                        os.path.isfile(os.path.join(dir_path, "attributes.yaml")),
-                        flags.overwrite in ["file", "files", "image", True]
-                        ]):
-                    print(
-                        "Found image "
-                        + relpath
-                        + " - "
-                        + "overwriting attributes in "
-                        + dir_name
-                        + ' (overwrite={})'.format(flags.overwrite)
-                    )
-
-            ## write attributes file
-            attributes = {
-                "image_original": image_data_original,
-                "image_phenopype": image_data_phenopype,
-            }
-            utils_lowlevel._save_yaml(
-                attributes, os.path.join(dir_path, "attributes.yaml")
-            )
-
-        ## list dirs in data and add to project-attributes file in project root
-        project_attributes = utils_lowlevel._load_yaml(
-            os.path.join(self.root_dir, "attributes.yaml")
-        )
+            jobs.setdefault(dir_path, []).append((file_path, dir_name, dir_path, relpath))
+            
+        ## copy/convert images and write attributes in parallel - each folder
+        ## is handled by one worker, and file I/O and OpenCV release the GIL
+        def _run_jobs(job_list):
+            messages = []
+            for job in job_list:
+                messages.extend(self._add_file(
+                    *job, 
+                    flags=flags, 
+                    resize_factor=resize_factor, 
+                    resize_max_dim=resize_max_dim, 
+                    image_format=image_format,
+                    date_added=date_added,
+                    ))
+            return messages
+        
+        if len(jobs) > 0:
+            n_workers = kwargs.get("n_workers", os.cpu_count() or 8)
+            with ThreadPoolExecutor(max_workers=min(n_workers, len(jobs))) as executor:
+                futures = [executor.submit(_run_jobs, job_list) for job_list in jobs.values()]
+                for future in futures:
+                    for message in future.result():
+                        print(message)
+
+        ## add dirs in data to project-attributes file in project root - the
+        ## attributes are kept on the instance, no need to parse the file again
+        project_attributes = self.attributes
         if any([flags.overwrite,
                 project_attributes["project_data"].__class__.__name__ in ["CommentedSeq","list"]]):
             project_attributes["project_data"] = {}
             
+        ## dirlists on the project object are kept up to date inside the loop
         project_attributes["project_data"]["filenames"] = filenames
-        project_attributes["project_data"]["dirnames"] =  os.listdir(os.path.join(self.root_dir, "data"))
+        project_attributes["project_data"]["dirnames"] = list(self.dir_names)
         
         utils_lowlevel._save_yaml(
             project_attributes, 
             os.path.join(self.root_dir, "attributes.yaml")
         )
 
-        ## add dirlists to project object (always overwrite)
-        dir_names = os.listdir(os.path.join(self.root_dir, "data"))
-        dir_paths = []
-        for dir_name in dir_names:
-            dir_paths.append(os.path.join(self.root_dir, "data", dir_name))
-        self.dir_names = dir_names
-        self.dir_paths = dir_paths
-
         print("\nFound {} files - using {}".format(n_total_found, n_max))
         print("--------------------------------------------")
 
@@ -610,15 +726,29 @@ class Project:
             p = Pype(container, tag="template-mod", config_path=config_path,)
             template_path = p.config_path
 
-        ## save config to each directory
+        ## save config to each directory - the config is rendered once and
+        ## the same text is written to every folder
         if os.path.isfile(template_path):
+            config_name = "pype_config_" + tag + ".yaml"
+            template_loaded = utils._load_template(template_path)
+            config_bytes = utils._render_template(
+                template_loaded, template_path, config_name
+            ).encode("utf-8")
+            config_paths = []
             for dir_path in self.dir_paths:
-                utils.load_template(
-                    template_path=template_path,
-                    dir_path=dir_path,
-                    tag=tag,
-                    overwrite=flag_overwrite,
-                )
+                config_path = os.path.join(dir_path, config_name)
+                if utils_lowlevel._save_prompt("template", config_path, flag_overwrite):
+                    config_paths.append(config_path)
+                    
+            ## overwrite checks and feedback run in order above, the plain 
+            ## writes are spread over a thread pool
+            def _write_config(config_path):
+                with open(config_path, "wb") as yaml_file:
+                    yaml_file.write(config_bytes)
+                    
+            if len(config_paths) > 0:
+                with ThreadPoolExecutor(max_workers=min(32, len(config_paths))) as executor:
+                    list(executor.map(_write_config, config_paths))
             _config.template_path_current = None
             _config.template_loaded_current = None
             
@@ -745,7 +875,7 @@ class Project:
                 "model_source_name": model_source_name,
                 "model_phenopype_path": phenopype_model_path,
                 "model_type": model_type,
-                "date_added": datetime.today().strftime(settings.strftime_format),
+                "date_added": settings.format_timestamp(),
             }
 
             ## load project attributes and temporarily drop project data list to
@@ -774,6 +904,7 @@ class Project:
             utils_lowlevel._save_yaml(
                 project_attributes, os.path.join(self.root_dir, "attributes.yaml")
             )
+            self.attributes = project_attributes
 
             print_save_msg = (
                 print_save_msg + "\nSaved model info to project attributes."
@@ -832,7 +963,7 @@ class Project:
 
         print_save_msg = "== no msg =="
 
-        reference_source_path = copy.deepcopy(reference_image_path)
+        reference_source_path = reference_image_path
 
         ## load reference image
         if reference_source_path.__class__.__name__ == "str":
@@ -924,7 +1055,7 @@ class Project:
                 "unit": annotations[settings._reference_type]["a"]["data"][
                     settings._reference_type
                 ][1],
-                "date_added": datetime.today().strftime(settings.strftime_format),
+                "date_added": settings.format_timestamp(),
             }
 
             ## load project attributes and temporarily drop project data list to
@@ -950,6 +1081,7 @@ class Project:
             utils_lowlevel._save_yaml(
                 project_attributes, os.path.join(self.root_dir, "attributes.yaml")
             )
+            self.attributes = project_attributes
             print_save_msg = (
                 print_save_msg + "\nSaved reference info to project attributes."
             )
@@ -963,7 +1095,9 @@ class Project:
 
         ## set active reference information in file specific attributes
         for dir_name, dir_path in zip(self.dir_names, self.dir_paths):
-            attr = utils_lowlevel._load_yaml(os.path.join(dir_path, "attributes.yaml"))
+            attr = utils_lowlevel._load_yaml_cached(
+                os.path.join(dir_path, "attributes.yaml"), self._yaml_cache
+            )
 
             ## create nested dict
             if not "reference_global" in attr:
@@ -978,8 +1112,8 @@ class Project:
                         attr["reference_global"][key]["active"] = True
                     else:
                         attr["reference_global"][key]["active"] = False
-                utils_lowlevel._save_yaml(
-                    attr, os.path.join(dir_path, "attributes.yaml")
+                utils_lowlevel._save_yaml_cached(
+                    attr, os.path.join(dir_path, "attributes.yaml"), self._yaml_cache
                 )
                 print(
                     'setting active global project reference to "'
@@ -1211,36 +1345,37 @@ class Project:
             exclude=["pype_config"] + exclude,
         )
 
-        ## collect
+        ## collect - destination path -> source path. a destination claimed 
+        ## earlier in this run counts as existing, so each destination is 
+        ## copied to once (last source wins with overwrite=True, as before)
+        copy_jobs = {}
         for file_path in found:
-            print(
-                "Collected "
-                + os.path.basename(file_path)
-                + " from "
-                + os.path.basename(os.path.dirname(file_path))
-            )
-            filename = (
-                os.path.basename(os.path.dirname(file_path))
-                + "_"
-                + os.path.basename(file_path)
-            )
+            parent_path, file_name = os.path.split(file_path)
+            dir_name = os.path.basename(parent_path)
+            print("Collected " + file_name + " from " + dir_name)
+            filename = dir_name + "_" + file_name
             path = os.path.join(results_path, filename)
 
-            ## overwrite check
-            while True:
-                if os.path.isfile(path) and flags.overwrite == False:
+            ## overwrite check - with overwrite=True the outcome doesn't depend
+            ## on whether the file exists, so don't check (a destination 
+            ## collected twice is still copied only once, the last one wins)
+            if flags.overwrite == True:
+                print(filename + " saved under " + path + " (overwrite=True).")
+            elif path in copy_jobs or os.path.isfile(path):
+                if flags.overwrite == False:
                     print(
                         filename + " not saved - file already exists (overwrite=False)."
                     )
-                    break
-                elif os.path.isfile(path) and flags.overwrite == True:
-                    print(filename + " saved under " + path + " (overwritten).")
-                    pass
-                elif not os.path.isfile(path):
-                    print(filename + " saved under " + path + ".")
-                    pass
-                shutil.copyfile(file_path, path)
-                break
+                    continue
+                print(filename + " saved under " + path + " (overwritten).")
+            else:
+                print(filename + " saved under " + path + ".")
+            copy_jobs[path] = file_path
+            
+        ## copy in parallel - feedback has already been printed above
+        if len(copy_jobs) > 0:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(shutil.copyfile, copy_jobs.values(), copy_jobs.keys()))
             
     def copy_tag(
             self, 
@@ -1314,7 +1449,7 @@ class Project:
                     print("Missing config for {} - skipping".format(dir_name))
 
                 
-    def edit_config(self, tag, target, replacement, **kwargs):
+    def edit_config(self, tag, target, replacement=None, **kwargs):
         """
         Add or edit functions in all configuration files of a project. Finds and
         replaces single or multiline string-patterns. Ideally this is done via 
@@ -1325,14 +1460,37 @@ class Project:
 
         tag: str
             tag (suffix) of config-file (e.g. "v1" in "pype_config_v1.yaml")
-        target: str
-            string pattern to be replaced. should be in triple-quotes to be exact
-        replacement: str
+        target: str or list
+            string pattern to be replaced. should be in triple-quotes to be exact.
+            can also be a list of (target, replacement) pairs that are all 
+            applied in one pass
+        replacement: str, optional
             string pattern for replacement. should be in triple-quotes to be exact
+            (not needed if target is a list of pairs)
         """
 
         ## setup
         flag_checked = False
+        
+        ## single replacements use str.replace, multiple ones a single regex
+        ## that is compiled once for all files
+        if isinstance(target, str):
+            if replacement is None:
+                print("No replacement provided - aborting.")
+                return
+            replace_pairs = [(target, replacement)]
+        else:
+            replace_pairs = [tuple(pair) for pair in target]
+        if len(replace_pairs) == 0 or any(pair[0] == "" for pair in replace_pairs):
+            print("Empty target provided - aborting.")
+            return
+        if len(replace_pairs) == 1:
+            replace_pattern = None
+        else:
+            replace_table = dict(replace_pairs)
+            replace_pattern = re.compile("|".join(
+                re.escape(pattern) for pattern in sorted(replace_table, key=len, reverse=True)
+                ))
 
         ## go through project directories
         for directory in self.dir_paths:
@@ -1345,13 +1503,22 @@ class Project:
 
             ## open config-file
             if os.path.isfile(config_path):
-                with open(config_path, "r") as config_text:
-                    config_string = config_text.read()
+                config_string = Path(config_path).read_text()
             else:
                 print("Did not find config file to edit - check provided tag/suffix.")
                 return
             ## string replacement
-            new_config_string = config_string.replace(target, replacement)
+            if replace_pattern is None:
+                new_config_string = config_string.replace(*replace_pairs[0])
+            else:
+                new_config_string = replace_pattern.sub(
+                    lambda match: replace_table[match.group(0)], config_string
+                )
+            
+            ## nothing to replace - leave the file untouched
+            if new_config_string == config_string:
+                print("Target not found in config of " + dir_name + " - skipping")
+                continue
 
             ## show user replacement-result and ask for confirmation
             if flag_checked == False:
@@ -1363,8 +1530,7 @@ class Project:
             ## replace for all config files after positive user check
             if check in settings.confirm_options:
                 flag_checked = True
-                with open(config_path, "w") as config_text:
-                    config_text.write(new_config_string)
+                Path(config_path).write_text(new_config_string)
 
                 print("New config saved for " + dir_name)
             else:
@@ -1465,7 +1631,7 @@ class Project:
                             test_pattern = file_name[-len(flags.tag):len(file_name)]
                             if not flags.tag == test_pattern:
                                 continue        
-                        if file_ext.strip(".") in settings.default_filetypes:
+                        if settings.is_image(file_ext):
                             if not flags.images:
                                 continue
                         if file_ext.strip(".") == "csv" and flags.exports == False:
@@ -1504,7 +1670,7 @@ class Project:
                         
                         file_name, file_ext  = os.path.splitext(file)
                                                 
-                        if file_ext.strip(".") in settings.default_filetypes:
+                        if settings.is_image(file_ext):
                             if not flags.images:
                                 continue
                         
@@ -1590,6 +1756,7 @@ class Project:
         if framework=="ml-morph":
 
             annotation_type = settings._landmark_type
+            pd = utils_lowlevel._pandas()
             df_summary = pd.DataFrame()
             file_path_save = os.path.join(training_data_path, "landmarks_ml-morph_" + tag + ".csv")
 
@@ -1825,18 +1992,32 @@ class Pype(object):
         ## don't autoshow if feedback is off
         if not self.flags.feedback:
             self.flags.autoshow = False
+            
+        ## config file is opened in the system editor once per pype
+        self._editor_launched = False
         
-        if image_path.__class__.__name__ == "str":
+        ## one stat of the input path, shared by the loaders below
+        image_path_mode = None
+        if isinstance(image_path, str):
             image_path = os.path.abspath(image_path)
+            try:
+                image_path_mode = os.stat(image_path).st_mode
+            except OSError:
+                pass
 
         ## check name, load container and config
         utils_lowlevel._check_pype_tag(tag)
-        self._load_container(image_path=image_path, tag=tag)
-        self._load_pype_config(image_path=image_path, tag=tag, config_path=config_path)
+        self._load_container(image_path=image_path, tag=tag, image_path_mode=image_path_mode)
+        self._load_pype_config(
+            image_path=image_path, 
+            tag=tag, 
+            config_path=config_path, 
+            image_path_mode=image_path_mode,
+        )
 
         # check version, load container and config
         if self.flags.dry_run:
-            self._load_pype_config(image_path, tag, config_path)
+            self._load_pype_config(image_path, tag, config_path, image_path_mode)
             self._iterate(config=self.config, annotations=copy.deepcopy(settings._annotation_types),
                       execute=False, autoshow=False, feedback=True)
             return
@@ -1871,6 +2052,9 @@ class Pype(object):
 
         ## start log
         self.log = []
+        
+        ## fingerprint of the monitored config currently in use
+        self._config_hash = None
 
         ## clear old zoom memory
         _config.gui_zoom_config = None
@@ -1897,7 +2081,11 @@ class Pype(object):
                     self._start_file_monitor(delay=delay)
                     continue
 
-                self.config = copy.deepcopy(self.YFM.content)
+                ## pick up the monitored config only if it changed - _iterate
+                ## stages its own changes copy-on-write, so no copy is needed
+                if not self.YFM.content_hash == self._config_hash:
+                    self.config = self.YFM.content
+                    self._config_hash = self.YFM.content_hash
 
                 if not self.config:
                     print("- STILL UPDATING CONFIG (no config)")
@@ -1924,7 +2112,7 @@ class Pype(object):
                         _config.gui_zoom_config = None
                     
                     ## add timestamp
-                    self.config["config_info"]["date_last_modified"] = datetime.today().strftime(settings.strftime_format)
+                    self.config["config_info"]["date_last_modified"] = settings.format_timestamp()
                     utils_lowlevel._save_yaml(self.config, self.config_path)
                         
                     ## feedback
@@ -1941,9 +2129,9 @@ class Pype(object):
                 export_list = self.config_parsed_flattened["export"]
             self.container.save(export_list=export_list)
 
-    def _load_container(self, image_path, tag):
-        if image_path.__class__.__name__ == "str":
-            if os.path.isfile(image_path):
+    def _load_container(self, image_path, tag, image_path_mode=None):
+        if isinstance(image_path, str):
+            if image_path_mode is not None and S_ISREG(image_path_mode):
                 image = utils.load_image(image_path)
                 dir_path = os.path.dirname(image_path)
                 self.container = utils.Container(
@@ -1954,7 +2142,7 @@ class Pype(object):
                     file_suffix=tag,
                     image_name=os.path.basename(image_path),
                 )
-            elif os.path.isdir(image_path):
+            elif image_path_mode is not None and S_ISDIR(image_path_mode):
                 self.container = utils_lowlevel._load_project_image_directory(
                     dir_path=image_path, tag=tag,
                 )
@@ -1964,32 +2152,27 @@ class Pype(object):
                         os.path.dirname(image_path)
                     )
                 )
-        elif image_path.__class__.__name__ == "Container":
+        elif isinstance(image_path, utils.Container):
             self.container = copy.deepcopy(image_path)
         else:
             raise TypeError("Invalid input for image path (str required)")
 
-    def _load_pype_config(self, image_path, tag, config_path):
+    def _load_pype_config(self, image_path, tag, config_path, image_path_mode=None):
 
-        if config_path.__class__.__name__ == "NoneType":
-            if os.path.isfile(image_path):
+        if config_path is None:
+            if image_path_mode is not None and S_ISREG(image_path_mode):
                 image_name_stem = os.path.splitext(os.path.basename(image_path))[0]
                 prepend = image_name_stem + "_"
-            elif os.path.isdir(image_path):
+            else:
                 prepend = ""
 
             ## generate config path from image file or directory (project)
             config_name = prepend + "pype_config_" + tag + ".yaml"
             config_path = os.path.join(self.container.dir_path, config_name)
+        else:
+            config_name = os.path.basename(config_path)
 
         ## load config from config path
-        elif config_path.__class__.__name__ == "str":
-            if os.path.isfile(config_path):
-                pass
-            # else:
-            #     raise FileNotFoundError(
-            #         "Could not read config file from specified config_path: \"{}\"".format(config_path))
-
         if os.path.isfile(config_path):
             self.config = utils_lowlevel._load_yaml(config_path)
             self.config_path = config_path
@@ -2008,41 +2191,51 @@ class Pype(object):
 
     def _start_file_monitor(self, delay):
 
-        if platform.system() == "Darwin":  # macOS
-            subprocess.call(("open", self.config_path))
-        elif platform.system() == "Windows":  # Windows
-            os.startfile(os.path.normpath(self.config_path))
-        else:  # linux variants
-            subprocess.call(("xdg-open", self.config_path))
+        ## open the config in the system editor only once - monitor restarts
+        ## reuse the window that is already open
+        if not self._editor_launched:
+            if _OPEN_CMD is None:  # Windows
+                os.startfile(os.path.normpath(self.config_path))
+            else:  # macOS and linux variants
+                subprocess.call(_OPEN_CMD + (self.config_path,))
+            self._editor_launched = True
 
         self.YFM = utils_lowlevel._YamlFileMonitor(self.config_path, delay)
 
     def _check_directory_skip(self, tag, skip_pattern, dir_path):
 
         ## skip directories that already contain specified files
-        if skip_pattern.__class__.__name__ == "str":
+        if isinstance(skip_pattern, str):
             skip_pattern = [skip_pattern]
-        elif skip_pattern.__class__.__name__ == "bool":
+        elif isinstance(skip_pattern, bool):
             skip_pattern = [""]
-        elif skip_pattern.__class__.__name__ in ["list", "CommentedSeq"]:
+        elif isinstance(skip_pattern, (list, CommentedSeq)):
             skip_pattern = skip_pattern
 
-        file_pattern = []
-        for pattern in skip_pattern:
-            file_pattern.append(pattern + "_" + tag)
-
-        filepaths, duplicates = utils_lowlevel._file_walker(
-            dir_path,
-            include=file_pattern,
-            include_all=False,
-            exclude=["pype_config", "attributes"],
-            pype_mode=True,
-        )
+        ## unique patterns
+        file_pattern = tuple(sorted(frozenset(
+            pattern + "_" + tag for pattern in skip_pattern
+            )))
+
+        ## the files live directly in the folder, so one listing is enough. 
+        ## one compiled alternation instead of a python-level test per 
+        ## pattern; exclusions first. an empty pattern list matches any file, 
+        ## like an empty include list did
+        files = []
+        match_pattern = re.compile(
+            "|".join(re.escape(pattern) for pattern in file_pattern)
+        ).search
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if _SKIP_EXCLUDE(name):
+                    continue
+                if not match_pattern(os.path.splitext(name)[0]):
+                    continue
+                if entry.is_file():
+                    files.append(name)
 
-        if len(filepaths) > 0:
-            files = []
-            for file in filepaths:
-                files.append(os.path.basename(file))
+        if len(files) > 0:
             print('\nFound existing files {} - skipped\n'.format((*files,)))
             return True
         else:
@@ -2053,22 +2246,44 @@ class Pype(object):
         ## check components before starting pype to see if something went wrong
         if (
             not hasattr(self.container, "image")
-            or self.container.image.__class__.__name__ == "NoneType"
+            or self.container.image is None
         ):
             raise AttributeError("No image was loaded")
             return
         if (
             not hasattr(self.container, "dir_path")
-            or self.container.dir_path.__class__.__name__ == "NoneType"
+            or self.container.dir_path is None
         ):
             raise AttributeError("Could not determine dir_path to save output.")
             return
-        if not hasattr(self, "config") or self.config.__class__.__name__ == "NoneType":
+        if not hasattr(self, "config") or self.config is None:
             raise AttributeError(
                 "No config file was provided or loading config did not succeed."
             )
             return
 
+    def _stage_config_update(self, step_idx, step_name, method_idx, method_entry):
+        
+        ## nothing to stage if the entry is already up to date
+        if method_entry == self.config["processing_steps"][step_idx][step_name][method_idx]:
+            return
+        self._config_dirty = True
+        
+        ## copy-on-write: only the containers along the path to the changed 
+        ## method are copied, everything else stays shared with self.config
+        if self.config_updated is self.config:
+            self.config_updated = utils_lowlevel._yaml_shallow_copy(self.config)
+            self.config_updated["processing_steps"] = utils_lowlevel._yaml_shallow_copy(
+                self.config["processing_steps"]
+            )
+        step_list = self.config_updated["processing_steps"]
+        if step_list[step_idx] is self.config["processing_steps"][step_idx]:
+            step_list[step_idx] = utils_lowlevel._yaml_shallow_copy(step_list[step_idx])
+            step_list[step_idx][step_name] = utils_lowlevel._yaml_shallow_copy(
+                step_list[step_idx][step_name]
+            )
+        step_list[step_idx][step_name][method_idx] = method_entry
+
     def _iterate(
         self, 
         config, 
@@ -2091,7 +2306,7 @@ class Pype(object):
         if flags.execute and not self.flags.dry_run:
             print(
                 "\n\n------------+++ new pype iteration "
-                + datetime.today().strftime(settings.strftime_format)
+                + time.strftime(settings.strftime_format)
                 + " +++--------------\n\n" +
                 "==> image name: "
                 + str(self.container.image_name)
@@ -2104,7 +2319,8 @@ class Pype(object):
 
         ## apply pype: loop through steps and contained methods
         step_list = self.config["processing_steps"]
-        self.config_updated = copy.deepcopy(self.config)
+        self.config_updated = self.config
+        self._config_dirty = False
         self.config_parsed_flattened = {}
                 
         for step_idx, step in enumerate(step_list):
@@ -2113,15 +2329,14 @@ class Pype(object):
             # STEP
             # =============================================================================
 
-            if step.__class__.__name__ == "str":
+            if isinstance(step, str):
                 continue
 
             ## get step name
-            step_name = list(dict(step).keys())[0]
-            method_list = list(dict(step).values())[0]
+            step_name, method_list = next(iter(step.items()))
             self.config_parsed_flattened[step_name] = []
 
-            if method_list.__class__.__name__ == "NoneType":
+            if method_list is None:
                 continue
 
             # =============================================================================
@@ -2130,18 +2345,17 @@ class Pype(object):
             
             ## print current step
             if flags.execute and flags.feedback:
-                print("\n")
-                print(step_name.upper())
+                print("\n\n" + step_name.upper())
 
             if step_name == "visualization" and flags.execute:
 
                 ## check if canvas is selected, and otherwise execute with default values
                 vis_list = [
-                    list(dict(i).keys())[0] if not isinstance(i, str) else i
+                    next(iter(i)) if not isinstance(i, str) else i
                     for i in method_list
                 ]
                 if (
-                    self.container.canvas.__class__.__name__ == "NoneType"
+                    self.container.canvas is None
                     and not "select_canvas" in vis_list
                 ):
                     self.container.run("select_canvas")
@@ -2156,14 +2370,13 @@ class Pype(object):
                 # =============================================================================
 
                 ## format method name and arguments
-                if method.__class__.__name__ in ["dict", "ordereddict", "CommentedMap"]:
-                    method = dict(method)
-                    method_name = list(method.keys())[0]
-                    if not list(method.values())[0].__class__.__name__ == "NoneType":
-                        method_args = dict(list(method.values())[0])
+                if isinstance(method, Mapping):
+                    method_name, method_args = next(iter(method.items()))
+                    if method_args is not None:
+                        method_args = dict(method_args)
                     else:
                         method_args = {}
-                elif method.__class__.__name__ == "str":
+                elif isinstance(method, str):
                     method_name = method
                     method_args = {}
 
@@ -2172,17 +2385,19 @@ class Pype(object):
                     print(method_name)
 
                 ## check if method exists
-                if hasattr(eval(step_name), method_name):
+                if method_name in _STEP_FUNCS.get(step_name, ()):
                     self.config_parsed_flattened[step_name].append(method_name)
                     pass
                 elif self.flags.fix_names:
-                    if method_name in settings._legacy_names[step_name]:
-                        method_name_updated = settings._legacy_names[step_name][
-                            method_name
-                        ]
-                        self.config_updated["processing_steps"][step_idx][step_name][
-                            method_idx
-                        ] = {method_name_updated: method_args}
+                    method_name_updated = settings._legacy_names_flat.get(
+                        (step_name, method_name)
+                    )
+                    if method_name_updated is not None:
+                        ## stage a copy - method_args is modified further below 
+                        ## (ANNOTATION removed, runtime args added)
+                        self._stage_config_update(
+                            step_idx, step_name, method_idx, {method_name_updated: dict(method_args)}
+                        )
                         method_name = method_name_updated
                         print("Stage: fixed method name")
                 else:
@@ -2196,33 +2411,31 @@ class Pype(object):
                 # METHOD / ANNOTATION
                 # =============================================================================
                 
-                if method_name in list(settings._annotation_functions.keys()) + ["convert_annotation"]:
+                if method_name in settings._annotation_functions or method_name == "convert_annotation":
                     if "ANNOTATION" in method_args:
                         annotation_args = dict(method_args["ANNOTATION"])
+                        annotation_args_existing = dict(annotation_args)
                         del method_args["ANNOTATION"]
                     else:
                         annotation_args = {}
+                        annotation_args_existing = None
                         method_args = dict(method_args)
                         print("Stage: add annotation control args")
+                else:
+                    annotation_args_existing = None
                 
                 ## annotation params
                 if method_name in settings._annotation_functions:
 
-                    annotation_counter[settings._annotation_functions[method_name]] += 1
+                    annotation_type = settings._annotation_functions[method_name]
+                    annotation_counter[annotation_type] += 1
 
                     if not "type" in annotation_args:
-                        annotation_args.update({"type": settings._annotation_functions[method_name]})
+                        annotation_args.update({"type": annotation_type})
                     if not "id" in annotation_args:
-                        annotation_args.update({"id": string.ascii_lowercase[annotation_counter[settings._annotation_functions[method_name]]]})
+                        annotation_args.update({"id": _ID_LETTERS[annotation_counter[annotation_type]]})
                     if not "edit" in annotation_args:
-                        annotation_args.update({"edit": "overwrite" if method_name in [
-                                    "contour_to_mask",
-                                    "detect_contour",
-                                    "detect_mask",
-                                    "compute_shape_features",
-                                    "compute_texture_features",
-                                    "detect_skeleton",
-                                ] else False })
+                        annotation_args.update({"edit": "overwrite" if method_name in _ANNOTATION_OVERWRITE_FUNCS else False })
 
 
                 elif method_name in ["convert_annotation"]:
@@ -2236,12 +2449,15 @@ class Pype(object):
                 else:
                     annotation_args = {}
 
-                ## create ANNOTATION string and add to config
-                if annotation_args:
+                ## create ANNOTATION string and add to config - unless the config
+                ## already contains it in full
+                if annotation_args and not annotation_args == annotation_args_existing:
                     annotation_args = utils_lowlevel._yaml_flow_style(annotation_args)
                     method_args_updated = {"ANNOTATION": annotation_args}
                     method_args_updated.update(method_args)
-                    self.config_updated["processing_steps"][step_idx][step_name][method_idx] = {method_name: method_args_updated}
+                    self._stage_config_update(
+                        step_idx, step_name, method_idx, {method_name: method_args_updated}
+                    )
 
                 # =============================================================================
                 # METHOD / EXECUTE
@@ -2290,7 +2506,7 @@ class Pype(object):
         # CONFIG-UPDATE AND AUTOSHOW (optional)
         # =============================================================================
 
-        if not self.config_updated == self.config:
+        if self._config_dirty:
             utils_lowlevel._save_yaml(self.config_updated, self.config_path)
             print("Updating pype config: applying staged changes")
 
@@ -2304,7 +2520,7 @@ class Pype(object):
                         
             try:
                 print("AUTOSHOW")
-                if self.container.canvas.__class__.__name__ == "NoneType":
+                if self.container.canvas is None:
                     self.container.run(fun="select_canvas")
                     print("- autoselect canvas")
 
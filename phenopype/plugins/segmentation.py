@@ -1,6 +1,5 @@
 #%% modules
 
-import copy
 import cv2
 import numpy as np
 import sys
@@ -92,7 +91,7 @@ def detect_object(
     # =============================================================================
     # execute
     
-    image_source = copy.deepcopy(image)
+    image_source = image.copy()
     
     if flags.binary_mask:
         binary_mask = np.zeros(image_source.shape, dtype="uint8")
@@ -1,44 +1,76 @@
 #%% load modules
 
-import cv2
-import numpy as np
+import os
+from datetime import datetime
+from functools import lru_cache
+from sys import intern
+from types import MappingProxyType
 
-from pprint import PrettyPrinter
+## cv2 and pprint are imported lazily, see "flags opencv" below
 
 
 #%% helper-class
 
+# from collections import OrderedDict
 # from importlib.resources import path
 # from pathlib import Path, PurePath
 
-# ## create template browser
+# ## create template browser - folders and templates are only created 
+# ## when they are accessed
 # class TemplateList:
 #     def __init__(self, root_path):
-#         for folder_path in list(Path(root_path).glob('[!__]*')):
-#             setattr(self, PurePath(folder_path).name, TemplateFolder(folder_path))
+#         self._root = Path(root_path)
+#         self._folders = None
+#     def _scan(self):
+#         if self._folders is None:
+#             self._folders = {p.name: TemplateFolder(p) for p in self._root.glob('[!__]*')}
+#         return self._folders
+#     def __getattr__(self, name):
+#         if name.startswith("_"):
+#             raise AttributeError(name)
+#         try:
+#             return self._scan()[name]
+#         except KeyError:
+#             raise AttributeError(name)
 #     def __repr__(self):
-#         no_repr_items = []
-#         dict_cleaned = {x: self.__dict__[x] for x in self.__dict__ if x not in no_repr_items}
-#         attrs = "\n".join("pype_templates.{} ({} files)".format(k, v.n_templates) for k, v in dict_cleaned.items())
+#         attrs = "\n".join("pype_templates.{} ({} files)".format(
+#             p.name, sum(1 for _ in p.glob('[!__]*'))) for p in self._root.glob('[!__]*'))
 #         return "Default Pype-templates:\n\n{}".format(attrs)
 
 # class TemplateFolder:
 #     def __init__(self, folder_path):
 #         self.name = PurePath(folder_path).name
-#         self.n_templates = len(list(Path(folder_path).glob('[!__]*')))
-#         for file_path in list(Path(folder_path).glob('[!__]*')):
-#             setattr(self, PurePath(file_path).stem, Template(file_path))
+#         self._path = Path(folder_path)
+#         self._templates = None
+#     @property
+#     def n_templates(self):
+#         return sum(1 for _ in self._path.glob('[!__]*'))
+#     def _scan(self):
+#         if self._templates is None:
+#             self._templates = {p.stem: Template(p) for p in self._path.glob('[!__]*')}
+#         return self._templates
+#     def __getattr__(self, name):
+#         if name.startswith("_"):
+#             raise AttributeError(name)
+#         try:
+#             return self._scan()[name]
+#         except KeyError:
+#             raise AttributeError(name)
 #     def __repr__(self):
-#         no_repr_items = ["name","n_templates"]
-#         dict_cleaned = {x: self.__dict__[x] for x in self.__dict__ if x not in no_repr_items}
-#         attrs = "\n".join("pype_templates.{}.{}".format(self.name, k) for k, v in dict_cleaned.items())
+#         attrs = "\n".join("pype_templates.{}.{}".format(self.name, p.stem) for p in self._path.glob('[!__]*'))
 #         return "Pype-templates in folder {}:\n\n{}".format(self.name, attrs)
 
+# ## parsed templates, shared by all Template objects (keyed by realpath)
+# _template_cache = OrderedDict()
+
 # class Template:
 #     def __init__(self, file_path):
 #         self.name = PurePath(file_path).stem
-#         self.path = str(PurePath(file_path))
-#         self.processing_steps = utils_lowlevel._load_yaml(file_path)
+#         self.path = os.path.realpath(file_path)
+#     @property
+#     def processing_steps(self):
+#         ## parsed on first access only, re-parsed if the file changed
+#         return utils_lowlevel._load_yaml_cached(self.path, _template_cache)
 #     def __repr__(self):
 #         return "Pype-template \"{}\":\n\n{}".format(self.name,
 #                                                     utils_lowlevel._show_yaml(
@@ -50,12 +82,33 @@ from pprint import PrettyPrinter
 
 #%% defaults
 
+## factors for auto-sizing drawing elements by image diagonal
 auto_line_width_factor = 0.0025
 auto_point_size_factor = 0.0025
 auto_text_width_factor = 0.0005
 auto_text_size_factor = 0.00025
 
-confirm_options = ["True", "true", "y", "yes", True]
+## indices into compute_auto_sizes, and the matching factor names
+AUTO_LINE, AUTO_POINT, AUTO_TEXT_WIDTH, AUTO_TEXT_SIZE = range(4)
+_auto_size_names = ("line_width", "point_size", "text_width", "text_size")
+
+
+def compute_auto_sizes(image_diagonal, **factors):
+    """
+    Line width, point size, text width and text size (index with AUTO_*) 
+    for an image diagonal in one go - at least 1 px each. The auto_*_factor 
+    settings are read on every call; single factors can be overridden by 
+    name, e.g. line_width=0.001.
+    """
+    sizes = []
+    for name in _auto_size_names:
+        factor = factors.get(name)
+        if factor is None:
+            factor = globals()["auto_" + name + "_factor"]
+        sizes.append(max(int(factor * image_diagonal), 1))
+    return tuple(sizes)
+
+confirm_options = frozenset(("True", "true", "y", "yes", True))
 
 _default_label_colour = "lime"
 _default_line_colour = "lime"
@@ -64,103 +117,221 @@ _default_overlay_left = "green"
 _default_overlay_right = "red"
 
 
-default_filetypes = ["jpg", "JPG", "jpeg", "JPEG", "tif", "png", "bmp"]
-default_meta_data_fields = [
+## lowercase only - extensions are lowercased before the lookup, see is_image
+default_filetypes = frozenset({"jpg", "jpeg", "tif", "png", "bmp"})
+default_meta_data_fields = (
     "DateTimeOriginal",
     "Model",
     "LensModel",
     "ExposureTime",
     "ISOSpeedRatings",
     "FNumber",
-]
+)
 
 default_save_suffix = "v1"
 default_window_size = 1000
 
 pandas_max_rows = 10
-pretty = PrettyPrinter(width=30)
 
 strftime_format = "%Y-%m-%d %H:%M:%S"
 
 
+@lru_cache(maxsize=4096)
+def parse_timestamp(timestamp):
+    """
+    Parse a timestamp string written with strftime_format. Cached (bounded), 
+    as the same attribute timestamps are parsed repeatedly.
+    """
+    return datetime.strptime(timestamp, strftime_format)
+
+
+def format_timestamp(dt=None):
+    """
+    Format a datetime (default: now) with strftime_format.
+    """
+    if dt is None:
+        dt = datetime.today()
+    return dt.strftime(strftime_format)
+
+
+def is_image(path):
+    """
+    Check whether a file path (or bare extension) has one of the 
+    default_filetypes extensions. Case-insensitive.
+    """
+    ext = os.path.splitext(path)[1] or path
+    return ext.lower().lstrip(".") in default_filetypes
+
+
 #%% flags
 
 flag_verbose = True
 
 #%% flags opencv
 
-opencv_contour_flags = {
-    "retrieval": {
-        "ext": cv2.RETR_EXTERNAL,  ## only external
-        "list": cv2.RETR_LIST,  ## all contours
-        "tree": cv2.RETR_TREE,  ## fully hierarchy
-        "ccomp": cv2.RETR_CCOMP,  ## outer perimeter and holes
-        "flood": cv2.RETR_FLOODFILL,  ## not sure what this does
-    },
-    "approximation": {
-        "none": cv2.CHAIN_APPROX_NONE,  ## all points (no approx)
-        "simple": cv2.CHAIN_APPROX_SIMPLE,  ## minimal corners
-        "L1": cv2.CHAIN_APPROX_TC89_L1,
-        "KCOS": cv2.CHAIN_APPROX_TC89_KCOS,
-    },
-}
-
-opencv_distance_flags = {
-    "user": cv2.DIST_USER,
-    "l1": cv2.DIST_L1,
-    "l2": cv2.DIST_L2,
-    "C": cv2.DIST_C,
-    "l12": cv2.DIST_L12,
-    "fair": cv2.DIST_FAIR,
-    "welsch": cv2.DIST_WELSCH,
-    "huber": cv2.DIST_HUBER,
-}
-
-opencv_interpolation_flags = {
-    "nearest": cv2.INTER_NEAREST,
-    "linear": cv2.INTER_LINEAR,
-    "cubic": cv2.INTER_CUBIC,
-    "area": cv2.INTER_AREA,
-    "lanczos": cv2.INTER_LANCZOS4,
-    "lin_exact": cv2.INTER_LINEAR_EXACT,
-    "inter": cv2.INTER_MAX,
-    "warp_fill": cv2.WARP_FILL_OUTLIERS,
-    "warp_inverse": cv2.WARP_INVERSE_MAP,
+## the opencv flag dicts (and the pretty printer) are built on first access 
+## through the module __getattr__ below, so importing settings doesn't pull 
+## in cv2. after that they are plain module attributes.
+
+def _build_contour_flags(cv2):
+    return {
+        "retrieval": {
+            "ext": cv2.RETR_EXTERNAL,  ## only external
+            "list": cv2.RETR_LIST,  ## all contours
+            "tree": cv2.RETR_TREE,  ## fully hierarchy
+            "ccomp": cv2.RETR_CCOMP,  ## outer perimeter and holes
+            "flood": cv2.RETR_FLOODFILL,  ## not sure what this does
+        },
+        "approximation": {
+            "none": cv2.CHAIN_APPROX_NONE,  ## all points (no approx)
+            "simple": cv2.CHAIN_APPROX_SIMPLE,  ## minimal corners
+            "L1": cv2.CHAIN_APPROX_TC89_L1,
+            "KCOS": cv2.CHAIN_APPROX_TC89_KCOS,
+        },
+    }
+
+def _build_distance_flags(cv2):
+    return {
+        "user": cv2.DIST_USER,
+        "l1": cv2.DIST_L1,
+        "l2": cv2.DIST_L2,
+        "C": cv2.DIST_C,
+        "l12": cv2.DIST_L12,
+        "fair": cv2.DIST_FAIR,
+        "welsch": cv2.DIST_WELSCH,
+        "huber": cv2.DIST_HUBER,
+    }
+
+def _build_interpolation_flags(cv2):
+    return {
+        "nearest": cv2.INTER_NEAREST,
+        "linear": cv2.INTER_LINEAR,
+        "cubic": cv2.INTER_CUBIC,
+        "area": cv2.INTER_AREA,
+        "lanczos": cv2.INTER_LANCZOS4,
+        "lin_exact": cv2.INTER_LINEAR_EXACT,
+        "inter": cv2.INTER_MAX,
+        "warp_fill": cv2.WARP_FILL_OUTLIERS,
+        "warp_inverse": cv2.WARP_INVERSE_MAP,
+    }
+
+def _build_morphology_flags(cv2):
+    return {
+        "shape_list": {
+            "cross": cv2.MORPH_CROSS,
+            "rect": cv2.MORPH_RECT,
+            "ellipse": cv2.MORPH_ELLIPSE,
+        },
+        "operation_list": {
+            "erode": cv2.MORPH_ERODE,
+            "dilate": cv2.MORPH_DILATE,
+            "open": cv2.MORPH_OPEN,
+            "close": cv2.MORPH_CLOSE,
+            "gradient": cv2.MORPH_GRADIENT,
+            "tophat": cv2.MORPH_TOPHAT,
+            "blackhat": cv2.MORPH_BLACKHAT,
+            "hitmiss": cv2.MORPH_HITMISS,
+        },
+    }
+
+def _build_skeletonize_flags(cv2):
+    return {
+        "zhangsuen": cv2.ximgproc.THINNING_ZHANGSUEN,
+        "guohall": cv2.ximgproc.THINNING_GUOHALL,
+    }
+
+def _build_window_flags(cv2):
+    return {
+        "normal": cv2.WINDOW_NORMAL,
+        "auto": cv2.WINDOW_AUTOSIZE,
+        "openGL": cv2.WINDOW_OPENGL,
+        "full": cv2.WINDOW_FULLSCREEN,
+        "free": cv2.WINDOW_FREERATIO,
+        "keep": cv2.WINDOW_KEEPRATIO,
+        "GUIexp": cv2.WINDOW_GUI_EXPANDED,
+        "GUInorm": cv2.WINDOW_GUI_NORMAL,
+    }
+
+_lazy_cv2_attributes = {
+    "opencv_contour_flags": _build_contour_flags,
+    "opencv_distance_flags": _build_distance_flags,
+    "opencv_interpolation_flags": _build_interpolation_flags,
+    "opencv_morphology_flags": _build_morphology_flags,
+    "opencv_skeletonize_flags": _build_skeletonize_flags,
+    "opencv_window_flags": _build_window_flags,
 }
 
-opencv_morphology_flags = {
-    "shape_list": {
-        "cross": cv2.MORPH_CROSS,
-        "rect": cv2.MORPH_RECT,
-        "ellipse": cv2.MORPH_ELLIPSE,
-    },
-    "operation_list": {
-        "erode": cv2.MORPH_ERODE,
-        "dilate": cv2.MORPH_DILATE,
-        "open": cv2.MORPH_OPEN,
-        "close": cv2.MORPH_CLOSE,
-        "gradient": cv2.MORPH_GRADIENT,
-        "tophat": cv2.MORPH_TOPHAT,
-        "blackhat": cv2.MORPH_BLACKHAT,
-        "hitmiss": cv2.MORPH_HITMISS,
-    },
+## flag categories for resolve_flag: (flag dict, sub-dict or None)
+_flag_categories = {
+    "contour_approximation": ("opencv_contour_flags", "approximation"),
+    "contour_retrieval": ("opencv_contour_flags", "retrieval"),
+    "distance": ("opencv_distance_flags", None),
+    "interpolation": ("opencv_interpolation_flags", None),
+    "morphology_operation": ("opencv_morphology_flags", "operation_list"),
+    "morphology_shape": ("opencv_morphology_flags", "shape_list"),
+    "skeletonize": ("opencv_skeletonize_flags", None),
+    "window": ("opencv_window_flags", None),
 }
 
-opencv_skeletonize_flags = {
-    "zhangsuen": cv2.ximgproc.THINNING_ZHANGSUEN,
-    "guohall": cv2.ximgproc.THINNING_GUOHALL,
-}
+def resolve_flag(category, key):
+    """
+    Resolve an opencv flag from its phenopype name, e.g. 
+    resolve_flag("interpolation", "linear"). Meant to be called once when 
+    a function's arguments are parsed - keep the returned int instead of 
+    looking it up again for every image or frame.
+
+    Parameters
+    ----------
+    category : str
+        one of the keys in settings._flag_categories
+    key : str
+        flag name within that category
+
+    Returns
+    -------
+    int
+        the opencv flag
+    """
+    if not category in _flag_categories:
+        raise KeyError("unknown flag category \"{}\" - choose from {}".format(
+            category, list(_flag_categories)))
+    return _flag_dict(category)[key]
+
+
+def _flag_dict(category):
+    dict_name, sub_name = _flag_categories[category]
+    flags = globals()[dict_name] if dict_name in globals() else __getattr__(dict_name)
+    return flags[sub_name] if sub_name else flags
+
+
+def _freeze(dictionary):
+    ## read-only view (nested), so the shared flag tables can't be modified 
+    return MappingProxyType({
+        k: _freeze(v) if isinstance(v, dict) else v for k, v in dictionary.items()
+    })
+
+
+@lru_cache(maxsize=None)
+def _pretty():
+    from pprint import PrettyPrinter
+    return PrettyPrinter(width=30)
+
+
+def __getattr__(name):
+    if name in _lazy_cv2_attributes:
+        import cv2
+        value = _freeze(_lazy_cv2_attributes[name](cv2))
+    elif name == "pretty":
+        value = _pretty()
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    
+    ## cache as a regular module attribute - __getattr__ only runs once
+    globals()[name] = value
+    return value
 
-opencv_window_flags = {
-    "normal": cv2.WINDOW_NORMAL,
-    "auto": cv2.WINDOW_AUTOSIZE,
-    "openGL": cv2.WINDOW_OPENGL,
-    "full": cv2.WINDOW_FULLSCREEN,
-    "free": cv2.WINDOW_FREERATIO,
-    "keep": cv2.WINDOW_KEEPRATIO,
-    "GUIexp": cv2.WINDOW_GUI_EXPANDED,
-    "GUInorm": cv2.WINDOW_GUI_NORMAL,
-}
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_cv2_attributes) + ["pretty"])
 
 #%% annotation definitions
 
@@ -169,16 +340,29 @@ _coord_type = "points"
 _coord_list_type = "polygons"
 _sequence_type = "drawings"
 
-## annotation data
-_comment_type = "comment"
-_contour_type = "contour"
-_drawing_type = "drawing"
-_landmark_type = "landmark"
-_line_type = "line"
-_mask_type = "mask"
-_reference_type = "reference"
-_shape_feature_type = "shape_features"
-_texture_feature_type = "texture_features"
+## annotation data - single source of truth for the type names. plain str 
+## constants (not an Enum), because they are written to and read from yaml 
+## and used as dict keys throughout
+class AnnotationType:
+    COMMENT = "comment"
+    CONTOUR = "contour"
+    DRAWING = "drawing"
+    LANDMARK = "landmark"
+    LINE = "line"
+    MASK = "mask"
+    REFERENCE = "reference"
+    SHAPE_FEATURES = "shape_features"
+    TEXTURE_FEATURES = "texture_features"
+
+_comment_type = AnnotationType.COMMENT
+_contour_type = AnnotationType.CONTOUR
+_drawing_type = AnnotationType.DRAWING
+_landmark_type = AnnotationType.LANDMARK
+_line_type = AnnotationType.LINE
+_mask_type = AnnotationType.MASK
+_reference_type = AnnotationType.REFERENCE
+_shape_feature_type = AnnotationType.SHAPE_FEATURES
+_texture_feature_type = AnnotationType.TEXTURE_FEATURES
 
 _annotation_functions = {
     ## comments
@@ -214,12 +398,35 @@ _annotation_functions = {
     ## texture_features
     "compute_texture_features": _texture_feature_type,
 }
-
-_annotation_types = list(set(_annotation_functions.values()))
+_annotation_functions = MappingProxyType({
+    intern(k): intern(v) for k, v in _annotation_functions.items()
+})
+
+## reverse lookup: annotation type -> functions that produce it
+_functions_by_annotation_type = {}
+for _function_name, _annotation_type in _annotation_functions.items():
+    _functions_by_annotation_type.setdefault(_annotation_type, []).append(_function_name)
+_functions_by_annotation_type = {
+    k: tuple(v) for k, v in _functions_by_annotation_type.items()
+}
+del _function_name, _annotation_type
+
+_annotation_types = frozenset({
+    _comment_type,
+    _contour_type,
+    _drawing_type,
+    _landmark_type,
+    _line_type,
+    _mask_type,
+    _reference_type,
+    _shape_feature_type,
+    _texture_feature_type,
+})
 
 #%% GUI definitions
 
-## find better solution
+## find better solution (needs numpy locally - settings doesn't import it)
+# import numpy as np
 # from phenopype import utils_lowlevel
 # g = utils_lowlevel._GUI(np.zeros((1, 1, 1), dtype="uint8"), window_control="external")
 # cv2.waitKey(1)
@@ -227,7 +434,7 @@ _annotation_types = list(set(_annotation_functions.values()))
 # _GUI_settings_args = list(g.settings.__dict__)
 # _GUI_data_args = list(g.data.keys())
 
-_GUI_settings_args = [
+_GUI_settings_args = (
     'feedback',
     'show_label',
     'label_colour',
@@ -254,15 +461,15 @@ _GUI_settings_args = [
     'window_control',
     'window_max_dim',
     'window_name',
- ]
+ )
 
-_GUI_data_args = [
+_GUI_data_args = (
     'comment', 
     'contour', 
     'points', 
     'polygons', 
     'drawings'
-    ]
+    )
 
 
 #%% legacy fun-names
@@ -291,3 +498,14 @@ _legacy_names = {
     },
     "export": {},
 }
+_legacy_names = MappingProxyType({
+    intern(step): MappingProxyType({intern(k): intern(v) for k, v in names.items()})
+    for step, names in _legacy_names.items()
+})
+
+## single-lookup table derived from the above: by (step, old name)
+_legacy_names_flat = {
+    (step, old_name): new_name
+    for step, names in _legacy_names.items()
+    for old_name, new_name in names.items()
+}
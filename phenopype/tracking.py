@@ -1,9 +1,7 @@
 #%% modules
 
-import copy
 import numpy as np
 import numpy.ma as ma
-import pandas as pd
 import cv2
 import os
 import pprint
@@ -80,6 +78,7 @@ class motion_tracker(object):
 
         ## for masks
         self.image = frame
+        pd = utils_lowlevel._pandas()
         self.df_image_data = pd.DataFrame(
             {
                 "filename": self.name,
@@ -358,6 +357,7 @@ class motion_tracker(object):
             self.detection_settings()
 
         ## initialize
+        pd = utils_lowlevel._pandas()
         self.df = pd.DataFrame()
         self.idx1, self.idx2 = (0, 0)
         self.capture = cv2.VideoCapture(self.path)
@@ -431,14 +431,14 @@ class motion_tracker(object):
 
                 # initiate tracking
                 fgmask = self.fgbg_subtractor.apply(self.frame)
-                fgmask_copy = copy.deepcopy(fgmask)
+                fgmask_copy = fgmask.copy()
                 self.frame_overlay = self.frame
 
                 # apply methods
                 if "methods" in vars(self):
                     idx = 0
                     for m in self.methods:
-                        fgmask_copy = copy.deepcopy(fgmask)
+                        fgmask_copy = fgmask.copy()
                         (
                             self.fgmask_mod,
                             self.overlay,
@@ -675,6 +675,7 @@ class tracking_method:
         ## initialize
         self.overlay = np.zeros_like(frame)
         self.overlay_bin = np.zeros(frame.shape[0:2], dtype=np.uint8)
+        pd = utils_lowlevel._pandas()
         self.frame_df = pd.DataFrame()
 
         if self.remove_shadows == True:
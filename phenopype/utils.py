@@ -8,10 +8,12 @@ import io
 import os
 import sys
 import json
+import numpy as np
 import webbrowser
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
 from dataclasses import make_dataclass
 from contextlib import redirect_stdout
 from pkg_resources import resource_filename
@@ -24,8 +26,19 @@ from phenopype import plugins
 from phenopype import settings
 from phenopype import utils_lowlevel
 
+## imread flags per load_image mode ("rgb" is converted after reading)
+_IMREAD_FLAGS = {
+    "default": cv2.IMREAD_COLOR,
+    "colour": cv2.IMREAD_COLOR,
+    "gray": cv2.IMREAD_GRAYSCALE,
+    "rgb": cv2.IMREAD_COLOR,
+}
+
+## parsed project attributes, see Container.load
+_attributes_cache = OrderedDict()
+
 classes = ["Container"]
-functions = ['load_image', "load_template", "print_colours", "save_image", "show_image"]
+functions = ['load_image', "load_images", "load_template", "print_colours", "save_image", "show_image"]
 
 def __dir__():
     return clean_namespace + classes + functions
@@ -58,9 +71,14 @@ class Container(object):
         ## set reference image
         self.image_copy = image
 
-        ## assign copies
-        self.image = copy.deepcopy(self.image_copy)
-        self.canvas = copy.deepcopy(self.image_copy)
+        ## working image gets its own copy, the canvas only a read-only view 
+        ## (drawing functions return new arrays)
+        self.image = image.copy() if image is not None else None
+        self.canvas = utils_lowlevel._read_only_view(image)
+        
+        ## grayscale version of the reference image, see select_canvas
+        self._gray_cache = None
+        self._gray_cache_src = None
 
         ## attributes (needs more order/cleaning)
         self.tag = kwargs.get("tag")
@@ -88,12 +106,12 @@ class Container(object):
         loaded = []
 
         ## load annotations
-        annotations_file_name = self._construct_file_name("annotations", ".json")
+        annotations_file_path = os.path.join(
+            self.dir_path, self._construct_file_name("annotations", ".json")
+        )
         
-        if annotations_file_name in os.listdir(self.dir_path):
-            annotations_loaded = core.export.load_annotation(
-                os.path.join(self.dir_path, annotations_file_name)
-            )
+        if os.path.isfile(annotations_file_path):
+            annotations_loaded = core.export.load_annotation(annotations_file_path)
             
             if contours == False:
                 if settings._contour_type in annotations_loaded:
@@ -122,12 +140,15 @@ class Container(object):
                 )
             )
 
-        ## global attributes
-        attr_proj_path = os.path.abspath(
-            os.path.join(self.dir_path, r"../../", "attributes.yaml")
-        )
+        ## global attributes (project root is two levels up: root/data/image)
+        dir_parents = Path(os.path.abspath(self.dir_path)).parents
+        project_dir = dir_parents[min(1, len(dir_parents) - 1)]
+        attr_proj_path = str(project_dir / "attributes.yaml")
         if os.path.isfile(attr_proj_path):
-            self.attr_proj = utils_lowlevel._load_yaml(attr_proj_path)
+            ## shared by all images of a project - only re-parsed when it changes
+            self.attr_proj = utils_lowlevel._load_yaml_cached(
+                attr_proj_path, _attributes_cache
+            )
 
         ## load attributes
         attr_local_path = os.path.join(self.dir_path, "attributes.yaml")
@@ -137,38 +158,35 @@ class Container(object):
 
             if "reference_global" in self.image_attributes:
 
-                ## load local (image specific) and global (project level) attributes
-                attr_proj_path = os.path.abspath(
-                    os.path.join(attr_local_path, r"../../../", "attributes.yaml")
-                )
-                attr_proj = utils_lowlevel._load_yaml(attr_proj_path)
+                ## global (project level) attributes were loaded above
+                attr_proj = self.attr_proj
 
                 ## find active project level references
-                n_active = 0
-                for key, value in self.image_attributes["reference_global"].items():
-                    if self.image_attributes["reference_global"][key]["active"] == True:
-                        active_ref = key
-                        n_active += 1
-                if n_active > 1:
+                active_refs = [
+                    key
+                    for key, value in self.image_attributes["reference_global"].items()
+                    if value.get("active") == True
+                ]
+                if len(active_refs) > 1:
                     print(
                         "WARNING: multiple active reference detected - fix with running add_reference again."
                     )
+                active_ref = active_refs[-1]
 
                 self.reference_active = active_ref
 
                 ## load tempate image from project level attributes
-                if "template_file_name" in attr_proj["reference"][active_ref]:
+                reference = attr_proj["reference"][active_ref]
+                if "template_file_name" in reference:
                     self.reference_template_image = cv2.imread(
                         str(
-                            Path(attr_local_path).parents[2]
+                            project_dir
                             / "reference"
-                            / attr_proj["reference"][active_ref]["template_file_name"]
+                            / reference["template_file_name"]
                         )
                     )
-                    self.reference_template_px_ratio = attr_proj["reference"][
-                        active_ref
-                    ]["template_px_ratio"]
-                    self.reference_unit = attr_proj["reference"][active_ref]["unit"]
+                    self.reference_template_px_ratio = reference["template_px_ratio"]
+                    self.reference_unit = reference["unit"]
 
                     loaded.append("reference template image loaded from root directory")
                     
@@ -204,8 +222,8 @@ class Container(object):
         """
 
         ## re-assign copies
-        self.image = copy.deepcopy(self.image_copy)
-        self.canvas = copy.deepcopy(self.image_copy)
+        self.image = self.image_copy.copy() if self.image_copy is not None else None
+        self.canvas = utils_lowlevel._read_only_view(self.image_copy)
 
     def run(
             self, 
@@ -248,8 +266,8 @@ class Container(object):
 
         ## edit handling
         if not all([
-                annotation_id.__class__.__name__ == "NoneType",
-                annotation_type.__class__.__name__ == "NoneType",
+                annotation_id is None,
+                annotation_type is None,
             ]):
             if annotation_type in annotations:
                 if annotation_id in annotations[annotation_type]:
@@ -274,17 +292,17 @@ class Container(object):
         ## preprocessing
         if fun == "blur":
             self.image = core.preprocessing.blur(self.image, **kwargs_function)
-        if fun == "create_mask":
+        elif fun == "create_mask":
             annotations_updated = core.preprocessing.create_mask(self.image, **kwargs_function)
-        if fun == "create_reference":
+        elif fun == "create_reference":
             annotations_updated = core.preprocessing.create_reference(self.image, **kwargs_function)
-        if fun == "detect_mask":
+        elif fun == "detect_mask":
             annotations_updated = core.preprocessing.detect_mask(self.image, **kwargs_function)
-        if fun == "detect_QRcode":
+        elif fun == "detect_QRcode":
             annotations_updated = core.preprocessing.detect_QRcode(self.image, **kwargs_function)
-        if fun == "write_comment":
+        elif fun == "write_comment":
             annotations_updated = core.preprocessing.write_comment(self.image, **kwargs_function)
-        if fun == "detect_reference":
+        elif fun == "detect_reference":
             if all(
                 hasattr(self, attr)
                 for attr in [
@@ -302,81 +320,81 @@ class Container(object):
                 )
             else:
                 print("- missing project level reference information, cannot detect")
-        if fun == "decompose_image":
+        elif fun == "decompose_image":
             self.image = core.preprocessing.decompose_image(self.image, **kwargs_function)
 
         ## plugins.segmentation
-        if fun == "detect_object":
+        elif fun == "detect_object":
             # if len(self.image.shape) == 2:
             #     self.image = copy.deepcopy(self.image_copy)
             self.image = plugins.segmentation.detect_object(self.image_copy, _config.active_model_path, **kwargs_function)
 
         ## core.segmentation
-        if fun == "contour_to_mask":
+        elif fun == "contour_to_mask":
             annotations_updated = core.segmentation.contour_to_mask(**kwargs_function)
-        if fun == "threshold":
+        elif fun == "threshold":
             self.image = core.segmentation.threshold(self.image, **kwargs_function)
-        if fun == "watershed":
+        elif fun == "watershed":
             self.image = core.segmentation.watershed(self.image, **kwargs_function)
-        if fun == "morphology":
+        elif fun == "morphology":
             self.image = core.segmentation.morphology(self.image, **kwargs_function)
-        if fun == "detect_contour":
+        elif fun == "detect_contour":
             annotations_updated = core.segmentation.detect_contour(self.image, **kwargs_function)
-        if fun == "edit_contour":
+        elif fun == "edit_contour":
             annotations_updated, self.image = core.segmentation.edit_contour(
                 self.canvas, ret_image=True, **kwargs_function
             )
             if "inplace" in kwargs_function:
                 annotations[settings._contour_type][kwargs_function["contour_id"]] = core.segmentation.detect_contour(self.image)[settings._contour_type]["a"]
-                self.image = copy.deepcopy(self.image_copy)
+                self.image = self.image_copy.copy()
                 # self.annotations.update(annotations)
 
                 
         ## core.measurement
-        if fun == "set_landmark":
+        elif fun == "set_landmark":
             annotations_updated = core.measurement.set_landmark(image=self.canvas, **kwargs_function)
-        if fun == "set_polyline":
+        elif fun == "set_polyline":
             annotations_updated = core.measurement.set_polyline(self.canvas, **kwargs_function)
-        if fun == "detect_skeleton":
+        elif fun == "detect_skeleton":
             annotations_updated = core.measurement.detect_skeleton(**kwargs_function)
-        if fun == "compute_shape_features":
+        elif fun == "compute_shape_features":
             annotations_updated = core.measurement.compute_shape_features(**kwargs_function)
-        if fun == "compute_texture_features":
+        elif fun == "compute_texture_features":
             annotations_updated = core.measurement.compute_texture_features(
                 self.image_copy, **kwargs_function
             )
 
         ## plugins.measurement
-        if fun == "detect_landmark":
+        elif fun == "detect_landmark":
             annotations_updated = plugins.measurement.detect_landmark(
                 image = self.image,
                 model_path = self.active_model_path,
                 **kwargs_function)
 
         ## visualization
-        if fun == "select_canvas":
+        elif fun == "select_canvas":
             core.visualization.select_canvas(self, **kwargs_function)
-        if fun == "draw_contour":
+        elif fun == "draw_contour":
             self.canvas = core.visualization.draw_contour(self.canvas, **kwargs_function)
-        if fun == "draw_landmark":
+        elif fun == "draw_landmark":
             self.canvas = core.visualization.draw_landmark(self.canvas, **kwargs_function)
-        if fun == "draw_mask":
+        elif fun == "draw_mask":
             self.canvas = core.visualization.draw_mask(self.canvas, **kwargs_function)
-        if fun == "draw_polyline":
+        elif fun == "draw_polyline":
             self.canvas = core.visualization.draw_polyline(self.canvas, **kwargs_function)
-        if fun == "draw_QRcode":
+        elif fun == "draw_QRcode":
             self.canvas = core.visualization.draw_QRcode(self.canvas, **kwargs_function)
-        if fun == "draw_reference":
+        elif fun == "draw_reference":
             self.canvas = core.visualization.draw_reference(self.canvas, **kwargs_function)
 
         ## export
-        if fun == "convert_annotation":
+        elif fun == "convert_annotation":
             annotations_updated = core.export.convert_annotation(**kwargs_function)
-        if fun == "save_annotation":
+        elif fun == "save_annotation":
             if not "file_name" in kwargs_function:
                 kwargs_function["file_name"] = self._construct_file_name("annotations", "json")
             core.export.save_annotation(dir_path=self.dir_path,**kwargs_function)
-        if fun == "save_canvas":
+        elif fun == "save_canvas":
             if not "file_name" in kwargs_function:
                 ext = kwargs_function.get("ext", ".jpg")
                 kwargs_function["file_name"] = self._construct_file_name("canvas", ext)
@@ -385,7 +403,7 @@ class Container(object):
                 dir_path=self.dir_path,
                 **kwargs_function,
             )
-        if fun == "save_ROI":
+        elif fun == "save_ROI":
             if not "file_name" in kwargs_function:
                 ext = kwargs_function.get("ext", ".jpg")
                 kwargs_function["file_name"] = self._construct_file_name("roi", ext)
@@ -398,7 +416,7 @@ class Container(object):
                 **kwargs_function,
             )
 
-        if fun == "export_csv":
+        elif fun == "export_csv":
             core.export.export_csv(
                 dir_path=self.dir_path,
                 save_prefix=self.file_prefix,
@@ -410,10 +428,7 @@ class Container(object):
         ## save annotation to dict
         if annotations_updated:
 
-            if not annotation_type in annotations:
-                annotations[annotation_type] = {}
-
-            annotations[annotation_type][annotation_id] = annotations_updated[annotation_type][annotation_id]
+            annotations.setdefault(annotation_type, {})[annotation_id] = annotations_updated[annotation_type][annotation_id]
             self.annotations.update(annotations)
 
 
@@ -521,18 +536,18 @@ def load_image(path, mode="default", **kwargs):
     flags = make_dataclass(cls_name="flags", fields=[("mode", str, mode)])
 
     ## load image
-    if path.__class__.__name__ == "str":
+    if isinstance(path, str):
         if os.path.isfile(path):
             ext = os.path.splitext(path)[1]
-            if ext.replace(".", "") in settings.default_filetypes:
-                if flags.mode == "default":
-                    image = cv2.imread(path)
-                elif flags.mode == "colour":
-                    image = cv2.imread(path, cv2.IMREAD_COLOR)
-                elif flags.mode == "gray":
-                    image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
-                elif flags.mode == "rgb":
-                    image = cv2.imread(path)
+            if settings.is_image(ext):
+                ## read bytes with numpy and decode in memory - unlike 
+                ## cv2.imread this also works with non-ASCII paths on Windows
+                buffer = np.fromfile(path, dtype=np.uint8)
+                if buffer.size > 0:
+                    image = cv2.imdecode(buffer, _IMREAD_FLAGS[flags.mode])
+                else:
+                    image = None
+                if flags.mode == "rgb" and image is not None:
                     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             else:
                 print(
@@ -553,6 +568,37 @@ def load_image(path, mode="default", **kwargs):
     return image
 
 
+def load_images(paths, mode="default", n_workers=None, **kwargs):
+    """
+    Load multiple images in parallel - reading and decoding happens inside 
+    opencv without holding the GIL, so threads overlap disk access and 
+    decoding.
+
+    Parameters
+    ----------
+    paths: list of str
+        paths to images stored on the harddrive
+    mode: {"default", "colour","gray", "rgb"} str, optional
+        image conversion on loading (see load_image)
+    n_workers: int, optional
+        number of threads to use. defaults to the number of cpus
+
+    Returns
+    -------
+    images: list of ndarray
+        loaded images, in the order of paths (None where loading failed)
+
+    """
+    
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        images = list(executor.map(lambda path: load_image(path, mode=mode, **kwargs), paths))
+
+    return images
+
+
 def load_template(
     template_path,
     tag="v1",
@@ -591,34 +637,21 @@ def load_template(
     flags = make_dataclass(cls_name="flags", fields=[("overwrite", bool, overwrite)])
 
     ## create config from template
-    if not _config.template_path_current == template_path:
-
-        if template_path.__class__.__name__ == "str":
-            if os.path.isfile(template_path):
-                template_loaded = utils_lowlevel._load_yaml(template_path)
-                _config.template_path_current = template_path
-                _config.template_loaded_current = utils_lowlevel._load_yaml(template_path)
-
-            else:
-                print("Could not find template_path")
-                return
-        else:
-            print("Wrong input format for template_path")
-            return
-    else:
-        template_loaded =  _config.template_loaded_current
+    template_loaded = _load_template(template_path)
+    if template_loaded is None:
+        return
 
     ## construct config-name
     if (
-        dir_path.__class__.__name__ == "NoneType"
-        and image_path.__class__.__name__ == "NoneType"
+        dir_path is None
+        and image_path is None
     ):
         print("Need to specify image_path or dir_path")
         return
 
     elif (
-        dir_path.__class__.__name__ == "str"
-        and image_path.__class__.__name__ == "NoneType"
+        isinstance(dir_path, str)
+        and image_path is None
     ):
         if os.path.isdir(dir_path):
             prepend = ""
@@ -626,12 +659,12 @@ def load_template(
             print("Could not find dir_path")
             return
 
-    elif dir_path.__class__.__name__ == "NoneType":
+    elif dir_path is None:
         dir_path = os.path.dirname(image_path)
         image_name_root = os.path.splitext(os.path.basename(image_path))[0]
         prepend = image_name_root + "_"
 
-    if tag.__class__.__name__ == "str":
+    if isinstance(tag, str):
         suffix = "_" + tag
     else:
         suffix = ""
@@ -639,6 +672,45 @@ def load_template(
     config_name = prepend + "pype_config" + suffix + ".yaml"
     config_path = os.path.join(dir_path, config_name)
 
+    config_string = _render_template(
+        template_loaded, template_path, config_name, keep_comments
+    )
+
+    if utils_lowlevel._save_prompt("template", config_path, flags.overwrite):
+        with open(config_path, "wb") as yaml_file:
+            yaml_file.write(config_string.encode("utf-8"))
+
+    if ret_path:
+        return config_path
+
+
+def _load_template(template_path):
+    
+    ## templates are parsed once and cached for repeated calls with the same 
+    ## path - callers modify what they get, so they receive a copy and the
+    ## cached template stays pristine
+    if not _config.template_path_current == template_path:
+
+        if isinstance(template_path, str):
+            if os.path.isfile(template_path):
+                _config.template_loaded_current = utils_lowlevel._load_yaml(template_path)
+                _config.template_path_current = template_path
+
+            else:
+                print("Could not find template_path")
+                return
+        else:
+            print("Wrong input format for template_path")
+            return
+        
+    return copy.deepcopy(_config.template_loaded_current)
+
+
+def _render_template(template_loaded, template_path, config_name, keep_comments=True):
+    
+    ## prepend config info and serialize - the output does not depend on the 
+    ## target folder, so it can be written to many folders at once
+
     ## strip template name
     if "template_locked" in template_loaded:
         template_loaded.pop("template_locked")
@@ -646,7 +718,7 @@ def load_template(
     config_info = {
         "config_info": {
             "config_name": config_name,
-            "date_created": datetime.today().strftime(settings.strftime_format),
+            "date_created": settings.format_timestamp(),
             "date_last_modified": None,
             "template_name": os.path.basename(template_path),
             "template_path": template_path,
@@ -671,12 +743,9 @@ def load_template(
         template_loaded = {**config_info, **template_loaded}
         utils_lowlevel._yaml_recursive_delete_comments(template_loaded)
 
-    if utils_lowlevel._save_prompt("template", config_path, flags.overwrite):
-        with open(config_path, "wb") as yaml_file:
-            yaml.dump(template_loaded, yaml_file)
-
-    if ret_path:
-        return config_path
+    with io.StringIO() as buf:
+        yaml.dump(template_loaded, buf)
+        return buf.getvalue()
 
 
 
@@ -696,6 +765,7 @@ def save_image(
     resize=1,
     ext="jpg",
     overwrite=False,
+    quality=95,
     **kwargs
 ):
     """Save an image (array) to jpg.
@@ -717,6 +787,9 @@ def save_image(
     resize: float, optional
         resize factor for the image (1 = 100%, 0.5 = 50%, 0.1 = 10% of
         original size).
+    quality: int, optional
+        JPEG quality (0-100) - lower values give smaller files and faster 
+        encoding. ignored for other formats
     kwargs:
         developer options
     """
@@ -734,10 +807,10 @@ def save_image(
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
-    ## resize
+    ## resize (only downsizing - otherwise the image is written as is)
     if resize < 1:
         image = cv2.resize(
-            image, (0, 0), fx=1 * resize, fy=1 * resize, interpolation=cv2.INTER_AREA
+            image, None, fx=resize, fy=resize, interpolation=cv2.INTER_AREA
         )
 
     ## construct save path
@@ -750,23 +823,17 @@ def save_image(
     path = os.path.join(dir_path, new_name)
 
     ## save
-    while True:
-        print_msg = None
-        if os.path.isfile(path) and flag_overwrite == False:
-            print_msg = "- image not saved - file already exists (overwrite=False)."
-            break
-        elif os.path.isfile(path) and flag_overwrite == True:
-            print_msg = "- image saved under " + path + " (overwritten)."
-            pass
-        elif not os.path.isfile(path):
-            print_msg = "- image saved under " + path + "."
-            pass
+    if os.path.isfile(path):
+        if flag_overwrite == False:
+            return
+        print_msg = "- image saved under " + path + " (overwritten)."
+    else:
+        print_msg = "- image saved under " + path + "."
 
-        if settings.flag_verbose:
-            print(print_msg)
+    if settings.flag_verbose:
+        print(print_msg)
 
-        cv2.imwrite(path, image)
-        break
+    cv2.imwrite(path, image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
 
 
 def show_image(
@@ -805,63 +872,59 @@ def show_image(
     flag_check = check
 
     ## load image
-    if image.__class__.__name__ == "ndarray":
+    if isinstance(image, np.ndarray):
         pass
-    elif image.__class__.__name__ == "list":
+    elif isinstance(image, list):
         pass
     else:
         print("wrong input format.")
         return
 
     ## open images list or single images
-    while True:
-        if isinstance(image, list):
-            if len(image) > 10 and flag_check == True:
-                warning_string = (
-                    "WARNING: trying to open "
-                    + str(len(image))
-                    + " images - proceed (y/n)?"
-                )
-                check = input(warning_string)
-                if check in ["y", "Y", "yes", "Yes"]:
-                    print("Proceed - Opening images ...")
-                    pass
-                else:
-                    print("Aborting")
-                    break
-            idx = 0
-            for i in image:
-                idx += 1
-                if i.__class__.__name__ == "ndarray":
-                    print("phenopype" + " - " + str(idx))
-                    utils_lowlevel._GUI(
-                        i,
-                        mode="",
-                        window_aspect=window_aspect,
-                        window_name="phenopype" + " - " + str(idx),
-                        window_control="external",
-                        **kwargs,
-                    )
-                    if position_reset == True:
-                        cv2.moveWindow(
-                            "phenopype" + " - " + str(idx),
-                            idx + idx * position_offset,
-                            idx + idx * position_offset,
-                        )
-                else:
-                    print("skipped showing list item of type " + i.__class__.__name__)
-            cv2.waitKey(0)
-            cv2.destroyAllWindows()
-            break
-        else:
-            utils_lowlevel._GUI(
-                image=image,
-                mode="",
-                window_aspect=window_aspect,
-                window_name="phenopype",
-                window_control="internal",
-                **kwargs,
+    if isinstance(image, list):
+        if len(image) > 10 and flag_check == True:
+            warning_string = (
+                "WARNING: trying to open "
+                + str(len(image))
+                + " images - proceed (y/n)?"
             )
-            cv2.waitKey(0)
-            cv2.destroyAllWindows()
-            break
+            check = input(warning_string)
+            if check in ["y", "Y", "yes", "Yes"]:
+                print("Proceed - Opening images ...")
+                pass
+            else:
+                print("Aborting")
+                return
+        ## open all windows first, then position them in one pass
+        window_positions = []
+        for idx, i in enumerate(image, 1):
+            if isinstance(i, np.ndarray):
+                window_name = "phenopype" + " - " + str(idx)
+                print(window_name)
+                utils_lowlevel._GUI(
+                    i,
+                    mode="",
+                    window_aspect=window_aspect,
+                    window_name=window_name,
+                    window_control="external",
+                    **kwargs,
+                )
+                window_positions.append((window_name, idx * (1 + position_offset)))
+            else:
+                print("skipped showing list item of type " + i.__class__.__name__)
+        if position_reset == True:
+            for window_name, position in window_positions:
+                cv2.moveWindow(window_name, position, position)
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
+    else:
+        utils_lowlevel._GUI(
+            image=image,
+            mode="",
+            window_aspect=window_aspect,
+            window_name="phenopype",
+            window_control="internal",
+            **kwargs,
+        )
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
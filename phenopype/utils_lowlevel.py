@@ -6,6 +6,8 @@ import numpy as np
 from dataclasses import make_dataclass
 import string
 import re
+import shutil
+import threading
 from _ctypes import PyObj_FromPtr
 from colour import Color
 
@@ -14,7 +16,7 @@ import ruamel.yaml
 from ruamel.yaml.constructor import SafeConstructor
 from ruamel.yaml import YAML
 
-from functools import wraps
+from functools import lru_cache, wraps
  
 from math import pi
 from math import sqrt
@@ -105,22 +107,24 @@ class _GUI:
             self.data[settings._comment_type] = ""
 
         ## GUI settings
+        image_height, image_width = image.shape[0:2]
+        auto_sizes = settings.compute_auto_sizes((image_height + image_width) / 2)
         self.settings = make_dataclass(cls_name='settings', fields=[
             
             ('show_label', bool, kwargs.get('show_label', False)),
             ('label_colour', tuple, kwargs.get('label_colour',settings._default_label_colour)),
-            ('label_size', int, kwargs.get('label_size', _auto_text_size(image))),
-            ('label_width', int, kwargs.get('label_width',_auto_text_width(image))),
+            ('label_size', int, kwargs.get('label_size', auto_sizes[settings.AUTO_TEXT_SIZE])),
+            ('label_width', int, kwargs.get('label_width', auto_sizes[settings.AUTO_TEXT_WIDTH])),
             
             ('show_nodes', bool, kwargs.get('show_nodes', False)),
             ('node_colour', tuple, _get_bgr(kwargs.get('node_colour',settings._default_point_colour))),
-            ('node_size', int, kwargs.get('node_size', _auto_point_size(image))),
+            ('node_size', int, kwargs.get('node_size', auto_sizes[settings.AUTO_POINT])),
             
             ('line_colour', tuple, kwargs.get('line_colour', settings._default_line_colour)),
-            ('line_width', int, kwargs.get('line_width', _auto_line_width(image))),
+            ('line_width', int, kwargs.get('line_width', auto_sizes[settings.AUTO_LINE])),
             
             ('point_colour', tuple, kwargs.get('point_colour', settings._default_point_colour)),
-            ('point_size', int, kwargs.get('point_size',  _auto_point_size(image))),
+            ('point_size', int, kwargs.get('point_size', auto_sizes[settings.AUTO_POINT])),
             
             ('overlay_blend', float, kwargs.get('overlay_blend', 0.2)),
             ('overlay_line_width', int, kwargs.get('overlay_line_width', 1)),
@@ -165,7 +169,7 @@ class _GUI:
             raise TypeError("GUI module did not receive array-type - aborting!")
 
         ## image
-        self.image = copy.deepcopy(image)
+        self.image = image.copy()
         self.image_width, self.image_height = self.image.shape[1], self.image.shape[0]
 
         ## binary image (for blending)
@@ -399,7 +403,7 @@ class _GUI:
                 0 : len(self.data[settings._comment_type]) - 1
             ]
 
-        self.canvas = copy.deepcopy(self.canvas_copy)
+        self.canvas = self.canvas_copy.copy()
         cv2.putText(
             self.canvas,
             "Enter " + self.label + ": " + self.data[settings._comment_type],
@@ -511,7 +515,7 @@ class _GUI:
                         // self.global_fy
                     ),
                 )
-                self.canvas = copy.deepcopy(self.canvas_copy)
+                self.canvas = self.canvas_copy.copy()
                 cv2.line(
                     self.canvas,
                     self.coords_prev,
@@ -639,7 +643,7 @@ class _GUI:
 
             ## start drawing temporary rectangle
             self.flags.rect_start = x, y
-            self.canvas_copy = copy.deepcopy(self.canvas)
+            self.canvas_copy = self.canvas.copy()
             
             if self.settings.show_nodes:
                 for coord_list in self.data[settings._coord_list_type]:
@@ -724,7 +728,7 @@ class _GUI:
         ## draw temporary rectangle
         elif self.flags.rect_start:
             if flags & cv2.EVENT_FLAG_LBUTTON:
-                self.canvas = copy.deepcopy(self.canvas_copy)
+                self.canvas = self.canvas_copy.copy()
                 self.rect_minpos = (
                     min(self.flags.rect_start[0], x),
                     min(self.flags.rect_start[1], y),
@@ -754,7 +758,7 @@ class _GUI:
                 self.colour_current = self.settings.overlay_colour_right
 
             ## start drawing and use current coords as start point
-            self.canvas = copy.deepcopy(self.canvas_copy)
+            self.canvas = self.canvas_copy.copy()
 
             ## convert cursor coords from zoomed canvas to original coordinate space
             self.ix, self.iy = x, y
@@ -768,7 +772,7 @@ class _GUI:
         ## finish drawing and update image_copy
         if event == cv2.EVENT_LBUTTONUP or event == cv2.EVENT_RBUTTONUP:
             self.flags.drawing = False
-            self.canvas = copy.deepcopy(self.canvas_copy)
+            self.canvas = self.canvas_copy.copy()
             self.data[settings._sequence_type].append(
                 [
                     self.data[settings._coord_type],
@@ -813,7 +817,7 @@ class _GUI:
             if flags < 1 and self.line_width_orig > 1:
                 self.line_width_orig -= 1
 
-            self.canvas = copy.deepcopy(self.canvas_copy)
+            self.canvas = self.canvas_copy.copy()
             self.settings.line_width = int(
                 self.line_width_orig
                 / ((self.zoom.x2 - self.zoom.x1) / self.image_width)
@@ -833,7 +837,7 @@ class _GUI:
     def _canvas_blend(self):
 
         ## create coloured overlay from binary image
-        self.colour_mask = copy.deepcopy(self.image_bin_copy)
+        self.colour_mask = self.image_bin_copy.copy()
         self.colour_mask = cv2.cvtColor(self.colour_mask, cv2.COLOR_GRAY2BGR)
         self.colour_mask[self.image_bin_copy == 0] = self.settings.overlay_colour_right
         self.colour_mask[self.image_bin_copy == 255] = self.settings.overlay_colour_left
@@ -923,7 +927,7 @@ class _GUI:
         )
 
         ## copy canvas for mousedrag refresh
-        self.canvas_copy = copy.deepcopy(self.canvas)
+        self.canvas_copy = self.canvas.copy()
 
         ## refresh canvas
         if refresh and self.settings.feedback:
@@ -932,9 +936,9 @@ class _GUI:
     def _canvas_renew(self):
 
         ## pull copy from original image
-        self.image_copy = copy.deepcopy(self.image)
+        self.image_copy = self.image.copy()
         if self.tool == "draw":
-            self.image_bin_copy = copy.deepcopy(self.image_bin)
+            self.image_bin_copy = self.image_bin.copy()
 
     def _zoom_fun(self, x, y):
         """
@@ -1078,7 +1082,8 @@ class _YamlFileMonitor:
         self.event_handler.on_any_event = self._on_update
 
         ## intitialize
-        self.content = _load_yaml(self.filepath)
+        self.content, self.content_hash = None, None
+        self._load_content()
         self.observer = Observer()
         self.observer.schedule(self.event_handler, self.dirpath, recursive=False)
         self.observer.start()
@@ -1093,7 +1098,7 @@ class _YamlFileMonitor:
             self.time_diff = self.time_end - self.time_start
 
         if self.time_diff > 1:
-            self.content = _load_yaml(self.filepath)
+            self._load_content()
             _config.window_close, _config.pype_restart = True, True
             cv2.destroyWindow("phenopype")
             cv2.waitKey(self.delay)
@@ -1102,6 +1107,21 @@ class _YamlFileMonitor:
 
         self.time_start = timer()
 
+    def _load_content(self):
+        
+        ## only parse again if the text actually changed - editors often 
+        ## fire several events per save
+        if not os.path.isfile(self.filepath):
+            print("Cannot load file from specified filepath")
+            self.content, self.content_hash = None, None
+            return
+        with open(self.filepath, "r") as file:
+            text = file.read()
+        content_hash = hash(text)
+        if not content_hash == self.content_hash:
+            self.content = _get_yaml().load(text)
+            self.content_hash = content_hash
+
     def _stop(self):
         self.observer.stop()
         self.observer.join()
@@ -1416,40 +1436,28 @@ def _update_annotations(
 #%% functions - GUI helpers
 
 
-def _auto_line_width(image, **kwargs):
-    factor = kwargs.get("factor", settings.auto_line_width_factor)
+def _auto_size(image, index, factor=None):
     image_height, image_width = image.shape[0:2]
     image_diagonal = (image_height + image_width) / 2
-    line_width = max(int(factor * image_diagonal), 1)
+    return settings.compute_auto_sizes(
+        image_diagonal, **{settings._auto_size_names[index]: factor}
+    )[index]
 
-    return line_width
 
+def _auto_line_width(image, **kwargs):
+    return _auto_size(image, settings.AUTO_LINE, kwargs.get("factor"))
 
-def _auto_point_size(image, **kwargs):
-    factor = kwargs.get("factor", settings.auto_point_size_factor)
-    image_height, image_width = image.shape[0:2]
-    image_diagonal = (image_height + image_width) / 2
-    point_size = max(int(factor * image_diagonal), 1)
 
-    return point_size
+def _auto_point_size(image, **kwargs):
+    return _auto_size(image, settings.AUTO_POINT, kwargs.get("factor"))
 
 
 def _auto_text_width(image, **kwargs):
-    factor = kwargs.get("factor", settings.auto_text_width_factor)
-    image_height, image_width = image.shape[0:2]
-    image_diagonal = (image_height + image_width) / 2
-    text_width = max(int(factor * image_diagonal), 1)
-
-    return text_width
+    return _auto_size(image, settings.AUTO_TEXT_WIDTH, kwargs.get("factor"))
 
 
 def _auto_text_size(image, **kwargs):
-    factor = kwargs.get("factor", settings.auto_text_size_factor)
-    image_height, image_width = image.shape[0:2]
-    image_diagonal = (image_height + image_width) / 2
-    text_size = max(int(factor * image_diagonal), 1)
-
-    return text_size
+    return _auto_size(image, settings.AUTO_TEXT_SIZE, kwargs.get("factor"))
 
 
 def _get_bgr(col_string):
@@ -1474,6 +1482,29 @@ def _get_bgr(col_string):
 #%% functions - YAML helpers
 
 
+## ruamel.yaml instances are not thread-safe, so each thread keeps its own
+_yaml_instances = threading.local()
+
+
+def _get_yaml(typ="rt", pure=False, width=None):
+    
+    ## build the dumper/loader setup once per thread and configuration
+    instances = getattr(_yaml_instances, "instances", None)
+    if instances is None:
+        instances = _yaml_instances.instances = {}
+        
+    key = (typ, pure, width)
+    yaml = instances.get(key)
+    if yaml is None:
+        yaml = YAML(typ=typ, pure=pure)
+        if not width.__class__.__name__ == "NoneType":
+            yaml.width = width
+        yaml.indent(mapping=4, sequence=4, offset=4)
+        instances[key] = yaml
+        
+    return yaml
+
+
 def _load_yaml(filepath, typ="rt", pure=False, legacy=False):
 
     ## this can read phenopype < 2.0 style config yaml files
@@ -1496,8 +1527,7 @@ def _load_yaml(filepath, typ="rt", pure=False, legacy=False):
             data.update(value)
 
     SafeConstructor.add_constructor(u"tag:yaml.org,2002:map", _construct_yaml_map)
-    yaml = YAML(typ=typ, pure=pure)
-    yaml.indent(mapping=4, sequence=4, offset=4)
+    yaml = _get_yaml(typ=typ, pure=pure)
 
     if isinstance(filepath, (Path, str)):
         if Path(filepath).is_file():
@@ -1511,10 +1541,45 @@ def _load_yaml(filepath, typ="rt", pure=False, legacy=False):
         return
 
 
+def _load_yaml_cached(filepath, cache, max_size=512):
+    
+    ## one stat per call - a changed mtime or size invalidates the entry
+    stat = os.stat(filepath)
+    key = (stat.st_mtime_ns, stat.st_size)
+    
+    entry = cache.get(filepath)
+    if entry is None or not entry[0] == key:
+        entry = (key, _load_yaml(filepath))
+        cache[filepath] = entry
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(filepath)
+        
+    ## callers mutate what they get, so the cached object stays untouched
+    return copy.deepcopy(entry[1])
+
+
+def _save_yaml_cached(dictionary, filepath, cache, max_size=512):
+    
+    ## skip the write if the content didn't change since it was cached
+    entry = cache.get(filepath)
+    if entry is not None and entry[1] == dictionary:
+        return False
+    
+    _save_yaml(dictionary, filepath)
+    stat = os.stat(filepath)
+    cache[filepath] = ((stat.st_mtime_ns, stat.st_size), copy.deepcopy(dictionary))
+    cache.move_to_end(filepath)
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+        
+    return True
+
+
 def _show_yaml(odict, ret=False, typ="rt"):
 
-    yaml = YAML(typ=typ)
-    yaml.indent(mapping=4, sequence=4, offset=4)
+    yaml = _get_yaml(typ=typ)
 
     if ret:
         with io.StringIO() as buf, redirect_stdout(buf):
@@ -1525,11 +1590,15 @@ def _show_yaml(odict, ret=False, typ="rt"):
 
 
 def _save_yaml(dictionary, filepath, typ="rt"):
-    yaml = YAML(typ=typ)
-    yaml.width = 160
-    yaml.indent(mapping=4, sequence=4, offset=4)
+    yaml = _get_yaml(typ=typ, width=160)
+    
+    ## serialize in memory first and write in one go - a failing dump leaves 
+    ## the existing file intact instead of truncated
+    with io.StringIO() as buf:
+        yaml.dump(dictionary, buf)
+        payload = buf.getvalue()
     with open(filepath, "w") as out:
-        yaml.dump(dictionary, out)
+        out.write(payload)
 
 
 def _yaml_flow_style(obj):
@@ -1541,6 +1610,15 @@ def _yaml_flow_style(obj):
     return ret
 
 
+def _yaml_shallow_copy(obj):
+    
+    ## shallow copy that keeps the comments and formatting of ruamel objects
+    ret = type(obj)(obj)
+    if hasattr(obj, "copy_attributes"):
+        obj.copy_attributes(ret)
+    return ret
+
+
 def _yaml_recursive_delete_comments(d):
     if isinstance(d, dict):
         for k, v in d.items():
@@ -1616,20 +1694,15 @@ def _convert_arr_tup_list(arr_list, add_first=False):
 
     tup_list = []
     for array in arr_list:
-        point_list = []
         
-        for idx, point in enumerate(array):
-            if type(array) == np.ndarray:
-                point_converted = tuple((int(point[0][0]), int(point[0][1])))
-            elif type(array) == list:
-                point_converted = tuple((int(point[0]), int(point[1])))
-            point_list.append(point_converted)
-            if idx == 0:
-                first_point = point_converted
+        ## opencv contours (N, 1, 2) and point lists (N, 2) alike: flatten to 
+        ## (N, 2) ints and let numpy build the python ints
+        points = np.asarray(array).reshape(-1, 2).astype(np.int64, copy=False)
+        point_list = list(map(tuple, points.tolist()))
                 
         ## add first point during contour->mask conversion
         if add_first:
-            point_list.append(first_point)
+            point_list.append(point_list[0])
             
         tup_list.append(point_list)
 
@@ -1640,11 +1713,9 @@ def _convert_tup_list_arr(tup_list):
     
     array_list = []
     if type(tup_list[0]) == list and len(tup_list[0])>2:
+        ## (N, 2) -> opencv contour layout (N, 1, 2) in one conversion
         for points in tup_list:
-            point_list = []
-            for point in points:
-                point_list.append([list(point)])
-            array_list.append(np.asarray(point_list, dtype="int32"))
+            array_list.append(np.asarray(points, dtype="int32").reshape(-1, 1, 2))
     elif type(tup_list[0]) == tuple or type(tup_list[0]) == list:
         array_list.append(np.asarray(tup_list, dtype="int32"))
         
@@ -1671,6 +1742,26 @@ def _check_pype_tag(tag):
                 )
 
 
+def _copy_file(src, dst):
+    
+    ## let the kernel copy the bytes (reflinks on copy-on-write filesystems)
+    ## instead of pushing them through userspace buffers - falls back to 
+    ## shutil where copy_file_range is unavailable (python < 3.8, non-linux)
+    ## or refused (e.g. cross-device on older kernels)
+    if os.path.isfile(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError("{!r} and {!r} are the same file".format(src, dst))
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    raise OSError("copy_file_range stopped early")
+                remaining -= copied
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+
+
 def _create_mask_bin(image, contours):
     mask_bin = np.zeros(image.shape[0:2], np.uint8)
     if (
@@ -1726,6 +1817,23 @@ def _equalize_histogram(image, detected_rect_mask, template):
     return interp_template_values[image]
 
 
+def _iter_files(directory, recursive=False):
+    
+    ## scandir walk in the same order as os.walk (files of a folder, then its
+    ## subfolders top-down); DirEntry carries the file type from the directory
+    ## listing, so there is no extra stat call per file
+    stack = [directory]
+    while len(stack) > 0:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry
+                elif recursive == True and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        stack.extend(reversed(subdirs))
+
+
 def _file_walker(
     directory,
     filetypes=[],
@@ -1746,7 +1854,8 @@ def _file_walker(
         "False" searches only current directory for valid files; "True" walks 
         through all subdirectories
     filetypes (optional): list of str
-        single or multiple string patterns to target files with certain endings
+        single or multiple file extensions to target (case-insensitive, with 
+        or without leading dot)
     include (optional): list of str
         single or multiple string patterns to target certain files to include
     include_all (optional): bool,
@@ -1765,7 +1874,7 @@ def _file_walker(
     """
     ## kwargs
     pype_mode = kwargs.get("pype_mode", False)
-    if not filetypes.__class__.__name__ == "list":
+    if filetypes.__class__.__name__ == "str":
         filetypes = [filetypes]
     if not include.__class__.__name__ == "list":
         include = [include]
@@ -1775,72 +1884,56 @@ def _file_walker(
     flag_recursive = recursive
     flag_unique = unique
 
-    ## find files
-    filepaths1, filepaths2, filepaths3, filepaths4 = [], [], [], []
-    if flag_recursive == True:
-        for root, dirs, files in os.walk(directory):
-            for file in os.listdir(root):
-                filepath = os.path.join(root, file)
-                if os.path.isfile(filepath):
-                    filepaths1.append(filepath)
-    else:
-        for file in os.listdir(directory):
-            filepath = os.path.join(directory, file)
-            if os.path.isfile(filepath):
-                filepaths1.append(filepath)
-
-    ## file endings
-    if len(filetypes) > 0:
-        for filepath in filepaths1:
-            if filepath.endswith(tuple(filetypes)):
-                filepaths2.append(filepath)
-    elif len(filetypes) == 0:
-        filepaths2 = filepaths1
-
-    ## include
-    if len(include) > 0:
-        for filepath in filepaths2:
-            if flag_include_all:
-                if all(inc in os.path.basename(filepath) for inc in include):
-                    filepaths3.append(filepath)
-            else:
-                if pype_mode:
-                    if any(inc in Path(filepath).stem for inc in include):
-                        filepaths3.append(filepath)
-                else:
-                    if any(inc in os.path.basename(filepath) for inc in include):
-                        filepaths3.append(filepath)
-    else:
-        filepaths3 = filepaths2
+    ## normalized file endings
+    ext_set = frozenset("." + ext.lower().lstrip(".") for ext in filetypes)
 
-    ## exclude
-    if len(exclude) > 0:
-        for filepath in filepaths3:
-            if not any(exc in os.path.basename(filepath) for exc in exclude):
-                filepaths4.append(filepath)
-    else:
-        filepaths4 = filepaths3
+    ## find and filter files in a single pass - all checks run on the name 
+    ## of the directory entry
+    filepaths = []
+    for entry in _iter_files(directory, recursive=flag_recursive):
+        name = entry.name
+        
+        ## file endings
+        if len(ext_set) > 0 and not os.path.splitext(name)[1].lower() in ext_set:
+            continue
+        
+        ## include
+        if len(include) > 0:
+            if flag_include_all:
+                if not all(inc in name for inc in include):
+                    continue
+            elif pype_mode:
+                stem = os.path.splitext(name)[0]
+                if not any(inc in stem for inc in include):
+                    continue
+            elif not any(inc in name for inc in include):
+                continue
+                
+        ## exclude
+        if len(exclude) > 0 and any(exc in name for exc in exclude):
+            continue
+        
+        filepaths.append(entry.path)
 
     ## check if files found
-    filepaths = filepaths4
     if len(filepaths) == 0 and not pype_mode:
         print("No files found under the given location that match given criteria.")
         return [], []
     
     ## allow unique filenames filepath or by filename only
-    filenames, unique_filename, unique, duplicate = [], [], [], []
-    for filepath in filepaths:
-        filenames.append(os.path.basename(filepath))
+    seen, unique, duplicate = set(), [], []
     if flag_unique in ["filepaths", "filepath", "path"]:
-        for filename, filepath in zip(filenames, filepaths):
-            if not filepath in unique:
+        for filepath in filepaths:
+            if not filepath in seen:
+                seen.add(filepath)
                 unique.append(filepath)
             else:
                 duplicate.append(filepath)
     elif flag_unique in ["filenames", "filename", "name"]:
-        for filename, filepath in zip(filenames, filepaths):
-            if not filename in unique_filename:
-                unique_filename.append(filename)
+        for filepath in filepaths:
+            filename = os.path.basename(filepath)
+            if not filename in seen:
+                seen.add(filename)
                 unique.append(filepath)
             else:
                 duplicate.append(filepath)
@@ -1967,6 +2060,29 @@ def _load_image_data(image_path, path_and_type=True, image_rel_path=None, resize
     ## return image data
     return image_data
 
+@lru_cache(maxsize=None)
+def _pandas():
+    
+    ## pandas is only imported by the functions that build dataframes, so 
+    ## importing phenopype doesn't pay for it
+    import pandas as pd
+    pd.options.display.max_rows = settings.pandas_max_rows
+    
+    return pd
+
+
+def _read_only_view(image):
+    
+    ## shares memory with image, but in-place writes raise instead of
+    ## silently modifying the original
+    if image is None:
+        return None
+    view = image.view()
+    view.flags.writeable = False
+    
+    return view
+
+
 def _resize_image(
         image, 
         factor=1, 
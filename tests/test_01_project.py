@@ -49,6 +49,64 @@ def test_project_add_files(project, settings):
     
     
     
+def test_project_add_files_overwrite(settings):
+    
+    with mock.patch('builtins.input', return_value="y"):
+        project = pp.Project(root_dir=os.path.join(pytest.test_dir, "project_add_files"))
+    
+    ## one folder per image, named after the image as in a sequential run
+    image_names = [
+        file_name for file_name in os.listdir(pytest.image_dir) 
+        if "stickle" in file_name and pp.settings.is_image(file_name)
+        ]
+    dir_names = ["0__" + os.path.splitext(file_name)[0] for file_name in image_names]
+    
+    def check_project():
+        assert sorted(project.dir_names) == sorted(dir_names)
+        assert project.dir_paths == [
+            os.path.join(project.root_dir, "data", dir_name) for dir_name in project.dir_names
+            ]
+        project_attributes = pp.utils_lowlevel._load_yaml(
+            os.path.join(project.root_dir, "attributes.yaml"))
+        assert project_attributes["project_data"]["dirnames"] == project.dir_names
+        for dir_path in project.dir_paths:
+            attributes = pp.utils_lowlevel._load_yaml(os.path.join(dir_path, "attributes.yaml"))
+            image_name = attributes["image_original"]["filename"]
+            assert os.path.basename(dir_path) == "0__" + os.path.splitext(image_name)[0]
+            assert attributes["image_phenopype"]["mode"] == "link"
+    
+    project.add_files(
+        image_dir=pytest.image_dir, 
+        mode="link", 
+        include="stickle",
+        overwrite="dir",
+        )
+    check_project()
+    
+    ## overwrite="file" keeps the folders and their other content
+    marker_path = os.path.join(project.dir_paths[0], "marker.txt")
+    open(marker_path, "w").close()
+    project.add_files(
+        image_dir=pytest.image_dir, 
+        mode="link", 
+        include="stickle",
+        overwrite="file",
+        )
+    check_project()
+    assert os.path.isfile(marker_path)
+    
+    ## overwrite="dir" replaces them
+    project.add_files(
+        image_dir=pytest.image_dir, 
+        mode="link", 
+        include="stickle",
+        overwrite="dir",
+        )
+    check_project()
+    assert not os.path.isfile(marker_path)
+    
+    
+    
 def test_project_add_config(project, settings):
        
     project.add_config(
@@ -108,6 +166,38 @@ def test_project_edit_config(project, settings):
             
     assert success
     
+    
+    
+def test_project_edit_config_pairs(project, settings):
+    
+    path = os.path.join(project.dir_paths[0],  "pype_config_" + pytest.tag_1 + ".yaml")
+    swap_pairs = [
+        (pytest.edit_config_replacement, pytest.edit_config_target),
+        (pytest.edit_config_target, pytest.edit_config_replacement),
+        ]
+    
+    ## empty targets are rejected and leave the file untouched
+    with open(path) as f:
+        config_before = f.read()
+    project.edit_config(tag=pytest.tag_1, target=[("", "tool: polygon")])
+    project.edit_config(tag=pytest.tag_1, target=[])
+    with open(path) as f:
+        assert f.read() == config_before
+    
+    ## all pairs are applied in one pass, so swapping goes one way only
+    with mock.patch('builtins.input', return_value="y"):
+        project.edit_config(tag=pytest.tag_1, target=swap_pairs)
+    with open(path) as f:
+        config_string = f.read()
+    assert pytest.edit_config_target in config_string
+    assert not pytest.edit_config_replacement in config_string
+    
+    ## swap back
+    with mock.patch('builtins.input', return_value="y"):
+        project.edit_config(tag=pytest.tag_1, target=swap_pairs)
+    with open(path) as f:
+        assert f.read() == config_before
+    
 
     
 def test_collect_results(project, settings):
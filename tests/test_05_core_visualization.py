@@ -185,3 +185,38 @@ def test_draw_reference(canvas, reference_created, reference_detected):
 
 
 
+
+
+
+def test_container_canvas_read_only(image, settings):
+    
+    container = pp.utils.Container(
+        image.copy(), 
+        dir_path=pytest.test_dir, 
+        image_name="stickle1",
+        )
+    image_copy = container.image_copy.copy()
+    
+    container.annotations = {
+        pp.settings._comment_type: {"a": {
+            "info": {"annotation_type": pp.settings._comment_type},
+            "settings": {},
+            "data": {
+                pp.settings._comment_type: "QRcode",
+                pp.settings._mask_type: [[(100, 100), (300, 100), (300, 300), (100, 300)]],
+                }
+            }}}
+    
+    ## draw on the raw and on the (cached) gray canvas, then select again
+    container.run("draw_QRcode")
+    pp.visualization.select_canvas(container, canvas="gray", multi_channel=False)
+    gray_canvas = container.canvas.copy()
+    container.run("draw_QRcode")
+    pp.visualization.select_canvas(container, canvas="gray", multi_channel=False)
+    
+    assert (container.canvas == gray_canvas).all()
+    
+    pp.visualization.select_canvas(container, canvas="raw")
+    
+    assert (container.canvas == image_copy).all()
+    assert (container.image_copy == image_copy).all()
@@ -33,6 +33,15 @@ def test_load_image(settings, project):
     assert image.__class__.__name__ == "ndarray"
 
 
+def test_load_images(settings):
+    
+    images = pp.load_images([pytest.image_path, "string", pytest.image_path], n_workers=2)
+
+    assert len(images) == 3
+    assert images[1] is None
+    assert images[0].shape == images[2].shape
+
+
 def test_template(settings, project):
     
     pp.load_template(
@@ -0,0 +1,55 @@
+#%% modules
+
+import pytest
+
+import phenopype as pp
+
+#%% tests
+
+
+def test_annotation_types():
+    
+    assert frozenset(pp.settings._annotation_functions.values()) == pp.settings._annotation_types
+
+
+def test_resolve_flag():
+    
+    assert pp.settings.resolve_flag("contour_retrieval", "ext") == \
+        pp.settings.opencv_contour_flags["retrieval"]["ext"]
+    with pytest.raises(KeyError):
+        pp.settings.resolve_flag("retrieval", "ext")
+
+
+def test_is_image():
+    
+    assert pp.settings.is_image("data/image.JPG")
+    assert pp.settings.is_image(".png")
+    assert not pp.settings.is_image("attributes.yaml")
+
+
+def test_functions_by_annotation_type():
+    
+    assert pp.settings._functions_by_annotation_type["mask"] == (
+        "contour_to_mask", "create_mask", "detect_mask")
+
+
+def test_timestamp_roundtrip():
+    
+    timestamp = pp.settings.format_timestamp()
+    assert pp.settings.format_timestamp(pp.settings.parse_timestamp(timestamp)) == timestamp
+
+
+def test_compute_auto_sizes():
+    
+    sizes = pp.settings.compute_auto_sizes(4000)
+    assert sizes[pp.settings.AUTO_LINE] == 10
+    assert sizes[pp.settings.AUTO_TEXT_SIZE] == 1
+    assert pp.settings.compute_auto_sizes(4000, line_width=0.001)[pp.settings.AUTO_LINE] == 4
+    
+    ## runtime changes to the factor settings take effect
+    factor = pp.settings.auto_line_width_factor
+    pp.settings.auto_line_width_factor = 0.005
+    try:
+        assert pp.settings.compute_auto_sizes(4000)[pp.settings.AUTO_LINE] == 20
+    finally:
+        pp.settings.auto_line_width_factor = factor